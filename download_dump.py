@@ -3,10 +3,17 @@
 Download Wikipedia dump and index files with resume capability.
 """
 
+import json
 import os
+import shutil
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 import requests
+import urllib3
 from tqdm import tqdm
 
 
@@ -15,11 +22,210 @@ INDEX_URL = "https://dumps.wikimedia.your.org/enwiki/latest/enwiki-latest-pages-
 
 DATA_DIR = Path(__file__).parent / "data"
 
+# Files at least this large are fetched over several Range connections
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+NUM_CONNECTIONS = 8
 
-def download_with_resume(url: str, output_path: Path, chunk_size: int = 8192) -> bool:
+
+def iter_response(response: requests.Response, buffer: bytearray) -> Iterator[memoryview]:
+    """
+    Stream a response body through one reusable buffer.
+    
+    Reads straight into the buffer instead of allocating a new bytes object
+    per chunk. Each yielded view is only valid until the next iteration.
+    urllib3 errors are re-raised as requests exceptions, as iter_content does.
+    
+    Args:
+        response: Streaming response (requests.get(..., stream=True))
+        buffer: Preallocated buffer; its size is the read size
+        
+    Yields:
+        Views of the buffer holding the next block of the body
+        
+    Raises:
+        requests.exceptions.RequestException: If reading the body fails
+    """
+    view = memoryview(buffer)
+    raw = response.raw
+    raw.decode_content = True
+    while True:
+        try:
+            n = raw.readinto(view)
+        except urllib3.exceptions.ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except urllib3.exceptions.DecodeError as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ConnectionError(e)
+        if not n:
+            break
+        yield view[:n]
+
+
+def download_parallel(
+    url: str,
+    output_path: Path,
+    total_size: int,
+    num_connections: int = NUM_CONNECTIONS,
+    chunk_size: int = 1 << 20
+) -> bool:
+    """
+    Download a file over several parallel HTTP Range requests.
+    
+    The output file is pre-sized and each range is written at its own
+    offset. Per-range progress is kept in a .part sidecar next to the file,
+    so an interrupted download resumes each range where it stopped.
+    
+    Args:
+        url: URL to download from (server must support byte ranges)
+        output_path: Where to save the file
+        total_size: Size of the remote file in bytes
+        num_connections: Number of concurrent Range requests
+        chunk_size: Read size per connection in bytes
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    part_path = output_path.with_name(output_path.name + '.part')
+    
+    # Load per-range progress, or split the file into fresh ranges
+    ranges = None
+    if part_path.exists() and output_path.exists():
+        with open(part_path) as f:
+            part = json.load(f)
+        if part.get('url') == url and part.get('total_size') == total_size:
+            ranges = part['ranges']
+    if ranges is None:
+        range_size = -(-total_size // num_connections)
+        ranges = [
+            [start, min(start + range_size, total_size), start]
+            for start in range(0, total_size, range_size)
+        ]
+    
+    lock = threading.Lock()
+    stop = threading.Event()
+    
+    def save_progress():
+        with lock:
+            data = json.dumps({'url': url, 'total_size': total_size, 'ranges': ranges})
+        with open(part_path, 'w') as f:
+            f.write(data)
+    
+    downloaded = sum(done - start for start, _, done in ranges)
+    if downloaded:
+        print(f"Resuming {output_path.name} ({downloaded:,} bytes done)")
+    
+    fd = os.open(output_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(fd, total_size)
+        save_progress()
+        
+        with tqdm(
+            total=total_size,
+            initial=downloaded,
+            unit='B',
+            unit_scale=True,
+            unit_divisor=1024,
+            desc=f"Downloading {output_path.name} ({len(ranges)} connections)",
+            ncols=100
+        ) as pbar:
+            
+            def fetch_range(byte_range):
+                _, end, done = byte_range
+                if done >= end:
+                    return
+                headers = {'Range': f'bytes={done}-{end - 1}'}
+                with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise requests.exceptions.RequestException(
+                            "Server ignored Range request"
+                        )
+                    for chunk in iter_response(response, bytearray(chunk_size)):
+                        if stop.is_set():
+                            return
+                        os.pwrite(fd, chunk, done)
+                        done += len(chunk)
+                        with lock:
+                            byte_range[2] = done
+                        pbar.update(len(chunk))
+                if done < end:
+                    raise requests.exceptions.RequestException(
+                        f"Range ended early at byte {done:,} of {end:,}"
+                    )
+            
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                futures = [executor.submit(fetch_range, r) for r in ranges]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    stop.set()
+                    raise
+    
+    except requests.exceptions.RequestException as e:
+        print(f"✗ Error downloading {output_path.name}: {e}", file=sys.stderr)
+        return False
+    except KeyboardInterrupt:
+        print(f"\n✗ Download interrupted. Run again to resume.", file=sys.stderr)
+        return False
+    finally:
+        # Record fetched ranges however the run ended so a resume skips them
+        os.close(fd)
+        save_progress()
+    
+    part_path.unlink()
+    print(f"✓ Downloaded {output_path.name}")
+    return True
+
+
+def download_with_aria2(url: str, output_path: Path, connections: int = 16) -> bool:
+    """
+    Download a file with aria2c (segmented, resumable).
+    
+    aria2c keeps its own .aria2 control file next to the output and
+    continues a partial file with -c, so interrupted runs resume as well.
+    
+    Args:
+        url: URL to download from
+        output_path: Where to save the file
+        connections: Connections per file
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    cmd = [
+        'aria2c',
+        '-x', str(connections),
+        '-s', str(connections),
+        '-c',
+        '--file-allocation=falloc',
+        '--summary-interval=0',
+        '--console-log-level=warn',
+        '-d', str(output_path.parent),
+        '-o', output_path.name,
+        url
+    ]
+    
+    try:
+        subprocess.run(cmd, check=True)
+    except subprocess.CalledProcessError as e:
+        print(f"✗ Error downloading {output_path.name}: aria2c exited with {e.returncode}", file=sys.stderr)
+        return False
+    except KeyboardInterrupt:
+        print(f"\n✗ Download interrupted. Run again to resume.", file=sys.stderr)
+        return False
+    
+    print(f"✓ Downloaded {output_path.name}")
+    return True
+
+
+def download_with_resume(url: str, output_path: Path, chunk_size: int = 1 << 20) -> bool:
     """
     Download a file with resume capability and progress bar.
     
+    Uses aria2c when it is installed, otherwise downloads in Python.
+    
     Args:
         url: URL to download from
         output_path: Where to save the file
@@ -30,6 +236,12 @@ def download_with_resume(url: str, output_path: Path, chunk_size: int = 8192) ->
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
+    # A .part sidecar belongs to download_parallel's pre-sized file, which
+    # aria2c would mistake for a complete download
+    part_path = output_path.with_name(output_path.name + '.part')
+    if shutil.which('aria2c') and not part_path.exists():
+        return download_with_aria2(url, output_path)
+    
     # Check if file already exists
     if output_path.exists():
         existing_size = output_path.stat().st_size
@@ -45,6 +257,14 @@ def download_with_resume(url: str, output_path: Path, chunk_size: int = 8192) ->
         
         response = requests.head(url, allow_redirects=True)
         total_size = int(response.headers.get('content-length', 0))
+        accepts_ranges = response.headers.get('accept-ranges', '').lower() == 'bytes'
+        
+        # A .part sidecar means an unfinished parallel download; the file is
+        # pre-sized, so its size alone says nothing about completeness
+        if accepts_ranges and (
+            part_path.exists() or (existing_size == 0 and total_size >= PARALLEL_MIN_SIZE)
+        ):
+            return download_parallel(url, output_path, total_size)
         
         # Check if already complete
         if existing_size == total_size and total_size > 0:
@@ -64,7 +284,8 @@ def download_with_resume(url: str, output_path: Path, chunk_size: int = 8192) ->
         if existing_size > 0:
             desc += f" (resuming from {existing_size:,} bytes)"
             
-        with open(output_path, mode) as f:
+        # Unbuffered: writes go straight from the read buffer to the file
+        with open(output_path, mode, buffering=0) as f:
             with tqdm(
                 total=total_size,
                 initial=existing_size,
@@ -74,10 +295,9 @@ def download_with_resume(url: str, output_path: Path, chunk_size: int = 8192) ->
                 desc=desc,
                 ncols=100
             ) as pbar:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        pbar.update(len(chunk))
+                for chunk in iter_response(response, bytearray(chunk_size)):
+                    f.write(chunk)
+                    pbar.update(len(chunk))
         
         print(f"✓ Downloaded {output_path.name}")
         return True
@@ -5,11 +5,13 @@ Main Wikipedia processing script with parallel workers.
 
 import sys
 import bz2
+import shutil
+import subprocess
 import argparse
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Dict
 import multiprocessing as mp
-from multiprocessing import Pool
+import numpy as np
 import psutil
 import polars as pl
 import orjson
@@ -17,15 +19,54 @@ from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeEl
 from rich.console import Console
 from rich.table import Table
 
-from src.worker import process_chunk_with_retry
+from src.worker import RECORD_SCHEMA, chunk_output_path, get_dump_map, process_chunk_with_retry
+from src.number_categorizer import get_categorizer
 from src.checkpoint import StateManager, ProcessingState
-from src.sampler import WikipediaSampler
+from src.sampler import IndexEntries, WikipediaSampler, parse_index_lines
 
 
 console = Console()
 
+# Multi-threaded bzip2 decoders, used for the index when installed
+PARALLEL_BZIP2_TOOLS = ('lbzip2', 'pbzip2')
 
-def parse_index_file(index_path: Path) -> List[Tuple[int, int, str]]:
+# Completed chunks between state snapshots during a run
+STATE_SAVE_INTERVAL = 10
+
+# Task batches a worker handles before it is replaced by a fresh process,
+# which returns heap fragmentation and writer buffers to the OS
+WORKER_MAX_TASKS = 4
+
+
+def read_bz2(path: Path) -> bytes:
+    """
+    Decompress a whole bz2 file into memory.
+    
+    Pipes through lbzip2/pbzip2 when one is installed, which decode bz2
+    blocks on all cores; otherwise falls back to Python's single-threaded
+    bz2 module.
+    
+    Args:
+        path: Path to .bz2 file
+        
+    Returns:
+        Decompressed contents
+    """
+    for tool in PARALLEL_BZIP2_TOOLS:
+        executable = shutil.which(tool)
+        if executable:
+            result = subprocess.run(
+                [executable, '-dc', str(path)],
+                stdout=subprocess.PIPE,
+                check=True
+            )
+            return result.stdout
+    
+    with bz2.open(path, 'rb') as f:
+        return f.read()
+
+
+def parse_index_file(index_path: Path) -> IndexEntries:
     """
     Parse the multistream index file.
     
@@ -33,30 +74,18 @@ def parse_index_file(index_path: Path) -> List[Tuple[int, int, str]]:
         index_path: Path to index file
         
     Returns:
-        List of tuples: (byte_offset, article_id, title)
+        Index entries: byte offsets, article IDs and titles as columns
     """
     console.print(f"[cyan]Parsing index file: {index_path}[/cyan]")
     
-    entries = []
-    
-    with bz2.open(index_path, 'rt', encoding='utf-8') as f:
-        for line in f:
-            parts = line.strip().split(':', 2)
-            if len(parts) == 3:
-                try:
-                    offset = int(parts[0])
-                    article_id = int(parts[1])
-                    title = parts[2]
-                    entries.append((offset, article_id, title))
-                except ValueError:
-                    continue
+    entries = parse_index_lines(read_bz2(index_path))
     
     console.print(f"[green]✓ Found {len(entries):,} articles in index[/green]")
     return entries
 
 
 def create_chunks(
-    entries: List[Tuple[int, int, str]],
+    entries: IndexEntries,
     num_chunks: int,
     filter_article_ids: bool = True
 ) -> List[Dict]:
@@ -64,7 +93,7 @@ def create_chunks(
     Divide articles into chunks for parallel processing.
     
     Args:
-        entries: List of (offset, article_id, title) tuples
+        entries: Index entries
         num_chunks: Number of chunks to create
         filter_article_ids: If True, filter to specific article IDs (for random sampling).
                           If False, process all articles in byte range (for consecutive).
@@ -72,15 +101,14 @@ def create_chunks(
     Returns:
         List of chunk definitions
     """
-    # Group by offset (articles in same bz2 stream)
-    offset_groups = {}
-    for offset, article_id, title in entries:
-        if offset not in offset_groups:
-            offset_groups[offset] = []
-        offset_groups[offset].append(article_id)
-    
-    # Get unique offsets sorted
-    offsets = sorted(offset_groups.keys())
+    # Group by offset (articles in same bz2 stream): after a stable sort by
+    # offset, each stream's article IDs are one contiguous run starting at
+    # group_starts[i]
+    order = np.argsort(entries.offsets, kind='stable')
+    sorted_ids = entries.article_ids[order]
+    offsets, group_starts = np.unique(entries.offsets[order], return_index=True)
+    offsets = offsets.tolist()
+    group_starts = group_starts.tolist() + [len(sorted_ids)]
     
     # Divide into chunks
     chunks_per_group = max(1, len(offsets) // num_chunks)
@@ -93,20 +121,18 @@ def create_chunks(
             continue
         
         start_offset = chunk_offsets[0]
-        end_offset = chunk_offsets[-1] if i + chunks_per_group < len(offsets) else offsets[-1]
         
-        # Get next offset for boundary
-        next_idx = offsets.index(end_offset) + 1
+        # Get next offset for boundary (first offset of the next chunk)
+        next_idx = min(i + chunks_per_group, len(offsets))
         if next_idx < len(offsets):
             end_offset = offsets[next_idx]
         else:
             end_offset = -1  # Read to end
         
-        # Collect all article IDs in this chunk (or None to process all)
+        # Collect all article IDs in this chunk (or None to process all),
+        # as an int64 array, which pickles far smaller than a list of ints
         if filter_article_ids:
-            article_ids = []
-            for offset in chunk_offsets:
-                article_ids.extend(offset_groups[offset])
+            article_ids = sorted_ids[group_starts[i]:group_starts[next_idx]]
         else:
             # For consecutive sampling: process ALL articles in byte range
             article_ids = None
@@ -116,7 +142,7 @@ def create_chunks(
             'start_offset': start_offset,
             'end_offset': end_offset,
             'article_ids': article_ids,
-            'article_count': len(offset_groups[chunk_offsets[0]]) if filter_article_ids else -1
+            'article_count': len(article_ids) if filter_article_ids else -1
         })
     
     console.print(f"[green]✓ Created {len(chunks)} chunks[/green]")
@@ -138,7 +164,9 @@ def get_optimal_workers(verbose: bool = False) -> int:
     """
     available_ram = psutil.virtual_memory().available
     total_ram = psutil.virtual_memory().total
-    ram_per_worker = 500 * 1024 * 1024  # 500MB per worker
+    # 500MB per worker; workers are recycled every WORKER_MAX_TASKS batches,
+    # so their RSS stays near this instead of growing over long runs
+    ram_per_worker = 500 * 1024 * 1024
     cpu_cores = psutil.cpu_count(logical=False) or 4
     
     max_by_ram = available_ram // ram_per_worker
@@ -163,19 +191,83 @@ def get_optimal_workers(verbose: bool = False) -> int:
     return optimal
 
 
+# Settings shared by every task, set once per worker by init_worker
+_worker_settings: Dict = {}
+
+
+def init_worker(dump_path: Path, temp_dir: Path, enable_benchmarking: bool, strict: bool):
+    """
+    Pool initializer: store run-wide settings, map the dump and build the categorizer.
+    
+    The settings are sent once per worker instead of with every task, so a
+    task only carries its chunk's id, byte range and article IDs. Workers
+    start with the worker modules already imported (see get_pool_context),
+    so building the categorizer here only compiles the patterns and
+    trigger tables, up front instead of on the first article. The dump is
+    memory-mapped once here and every chunk of the worker reads from it.
+    
+    Args:
+        dump_path: Path to Wikipedia dump
+        temp_dir: Directory for per-chunk output files
+        enable_benchmarking: Enable detailed timing
+        strict: Strip markup with mwparserfromhell instead of the fast regex pass
+    """
+    _worker_settings.update(
+        dump_path=dump_path,
+        temp_dir=temp_dir,
+        enable_benchmarking=enable_benchmarking,
+        strict=strict
+    )
+    get_dump_map(dump_path)
+    get_categorizer()
+
+
+def get_pool_context():
+    """
+    Get the multiprocessing context used for the worker pool.
+    
+    Uses forkserver where available: workers are forked from a clean server
+    process that has imported the worker modules once, so they start fast
+    without re-importing. Plain fork is not safe here because the parent
+    has already used Polars (index parsing), and forking after its thread
+    pool has started can deadlock the children.
+    """
+    if 'forkserver' in mp.get_all_start_methods():
+        context = mp.get_context('forkserver')
+        context.set_forkserver_preload(['src.worker'])
+        return context
+    return mp.get_context()
+
+
+def get_chunksize(num_tasks: int, num_workers: int) -> int:
+    """
+    Determine how many chunks to hand a worker per pool dispatch.
+    
+    Aims for about four batches per worker, which amortizes pool IPC when
+    --chunks is much larger than the worker count while still leaving
+    enough batches to balance uneven chunks.
+    
+    Args:
+        num_tasks: Number of chunks to process
+        num_workers: Number of worker processes
+        
+    Returns:
+        Chunksize for Pool.imap_unordered
+    """
+    return max(1, num_tasks // (num_workers * 4))
+
+
 def worker_wrapper(args):
     """Wrapper for multiprocessing."""
-    chunk_id, dump_path, temp_dir, start_offset, end_offset, article_ids, enable_benchmarking = args
+    chunk_id, start_offset, end_offset, article_ids = args
     
     try:
         return process_chunk_with_retry(
             chunk_id=chunk_id,
-            dump_path=dump_path,
-            temp_dir=temp_dir,
             start_offset=start_offset,
             end_offset=end_offset,
             article_ids=article_ids,
-            enable_benchmarking=enable_benchmarking
+            **_worker_settings
         )
     except Exception as e:
         console.print(f"[red]✗ Chunk {chunk_id} failed: {e}[/red]")
@@ -199,53 +291,93 @@ def merge_parquet_files(temp_files: List[Path], output_path: Path):
         console.print("[red]✗ No data to merge[/red]")
         return
     
-    # Read and concatenate
-    dfs = []
+    # Check each file's footer up front so one corrupt chunk (or one left
+    # over from a run with a different record layout) doesn't abort the
+    # streaming merge halfway through
+    valid_files = []
+    schema = pl.Schema(RECORD_SCHEMA)
     for temp_file in temp_files:
         try:
-            df = pl.read_parquet(temp_file)
-            dfs.append(df)
+            file_schema = pl.read_parquet_schema(temp_file)
         except Exception as e:
             console.print(f"[yellow]Warning: Could not read {temp_file}: {e}[/yellow]")
+            continue
+        
+        if file_schema != schema:
+            console.print(f"[yellow]Warning: Skipping {temp_file}: schema does not match the record layout[/yellow]")
+            continue
+        
+        valid_files.append(temp_file)
     
-    if not dfs:
+    if not valid_files:
         console.print("[red]✗ No valid data files[/red]")
         return
     
-    # Concatenate all dataframes
-    final_df = pl.concat(dfs)
-    
-    # Write final file with zstd compression
+    # Stream row groups from the temp files straight into the final file
+    # with zstd compression, without materializing the whole dataset.
+    # Large pages let the dictionary/RLE encoding collapse runs of repeated
+    # domains and digits; page statistics allow filtering by category
+    # without a full scan.
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    final_df.write_parquet(output_path, compression='zstd')
+    pl.scan_parquet(valid_files).sink_parquet(
+        output_path,
+        compression='zstd',
+        statistics=True,
+        data_page_size=1 << 20
+    )
     
-    console.print(f"[green]✓ Merged {len(temp_files)} files into {output_path}[/green]")
-    console.print(f"[green]  Total records: {final_df.height:,}[/green]")
+    # Row count comes from the parquet footer
+    total_records = pl.scan_parquet(output_path).select(pl.len()).collect().item()
     
-    # Clean up temp files
-    for temp_file in temp_files:
+    console.print(f"[green]✓ Merged {len(valid_files)} files into {output_path}[/green]")
+    console.print(f"[green]  Total records: {total_records:,}[/green]")
+    
+    # Skipped files still hold the only copy of their chunks' records
+    skipped = len(temp_files) - len(valid_files)
+    if skipped:
+        console.print(f"[yellow]  Kept {skipped} unmerged temp file(s) in {temp_files[0].parent}[/yellow]")
+    
+    # Clean up merged temp files
+    for temp_file in valid_files:
         try:
             temp_file.unlink()
         except Exception:
             pass
 
 
+def digit_histogram(df: pl.DataFrame) -> np.ndarray:
+    """
+    Count how often each first digit occurs.
+    
+    Args:
+        df: Records with a first_digit column
+        
+    Returns:
+        Array of 9 counts for digits 1-9
+    """
+    return np.bincount(df['first_digit'].to_numpy(), minlength=10)[1:10]
+
+
 def generate_summary(data_path: Path, output_path: Path):
     """Generate summary JSON file."""
     console.print("[cyan]Generating summary...[/cyan]")
     
-    df = pl.read_parquet(data_path)
+    # Count every (domain, first digit) pair in one pass over two columns
+    digit_counts = (
+        pl.scan_parquet(data_path)
+        .group_by(['domain', 'first_digit'])
+        .agg(pl.len().alias('count'))
+        .sort(['domain', 'first_digit'])
+        .collect()
+    )
     
-    # Group by domain and first digit
     summary = {}
-    
-    for domain in df['domain'].unique().to_list():
-        domain_df = df.filter(pl.col('domain') == domain)
-        digit_counts = domain_df.group_by('first_digit').agg(pl.count()).sort('first_digit')
-        
-        summary[domain] = {}
-        for row in digit_counts.iter_rows(named=True):
-            summary[domain][str(row['first_digit'])] = row['count']
+    for domain, digit, count in zip(
+        digit_counts['domain'].cast(pl.String).to_list(),
+        digit_counts['first_digit'].to_list(),
+        digit_counts['count'].to_list(),
+    ):
+        summary.setdefault(domain, {})[str(digit)] = count
     
     # Write summary
     with open(output_path, 'wb') as f:
@@ -256,8 +388,6 @@ def generate_summary(data_path: Path, output_path: Path):
 
 def print_benchmark_stats(all_timings: List[Dict]):
     """Print detailed benchmark statistics."""
-    import statistics
-    
     console.print()
     console.print("[bold cyan]BENCHMARK RESULTS[/bold cyan]")
     console.print("="*60)
@@ -281,10 +411,10 @@ def print_benchmark_stats(all_timings: List[Dict]):
     
     for operation, times in sorted(aggregated.items()):
         if times:
-            mean_ms = statistics.mean(times) * 1000
-            median_ms = statistics.median(times) * 1000
-            p95_ms = sorted(times)[int(len(times) * 0.95)] * 1000 if len(times) > 1 else mean_ms
-            max_ms = max(times) * 1000
+            times_ms = np.asarray(times, dtype=np.float64) * 1000
+            mean_ms = times_ms.mean()
+            median_ms, p95_ms = np.percentile(times_ms, [50, 95])
+            max_ms = times_ms.max()
             
             table.add_row(
                 operation,
@@ -329,7 +459,8 @@ def process_wikipedia(
     sample_count: int = None,
     sample_seed: int = 42,
     consecutive: bool = False,
-    enable_benchmarking: bool = False
+    enable_benchmarking: bool = False,
+    strict: bool = False
 ):
     """
     Main processing function with optional sampling.
@@ -341,6 +472,7 @@ def process_wikipedia(
         num_workers: Number of parallel workers (auto if None)
         num_chunks: Number of chunks to create
         resume: Whether to resume from checkpoint
+        strict: Strip markup with mwparserfromhell instead of the fast regex pass
     """
     console.print("[bold cyan]Wikipedia Benford Analysis - Processing[/bold cyan]")
     console.print()
@@ -357,6 +489,8 @@ def process_wikipedia(
     if resume and state_path.exists():
         console.print("[yellow]Resuming from checkpoint...[/yellow]")
         state = state_manager.load()
+        # Fold the previous run's event log into the snapshot
+        state_manager.compact()
     else:
         console.print("[cyan]Starting new processing run...[/cyan]")
         state = ProcessingState()
@@ -417,8 +551,6 @@ def process_wikipedia(
     console.print()
     
     # Process chunks in parallel
-    temp_files = []
-    
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -433,16 +565,13 @@ def process_wikipedia(
             total=len(pending_chunks)
         )
         
-        # Prepare worker arguments
+        # Prepare worker arguments (run-wide settings go to init_worker)
         worker_args = [
             (
                 chunk['chunk_id'],
-                dump_path,
-                temp_dir,
                 chunk['start_offset'],
                 chunk['end_offset'],
-                chunk['article_ids'],
-                enable_benchmarking
+                chunk['article_ids']
             )
             for chunk in pending_chunks
         ]
@@ -451,20 +580,37 @@ def process_wikipedia(
         all_timings = []
         
         # Process with pool
-        with Pool(processes=num_workers) as pool:
-            for result in pool.imap_unordered(worker_wrapper, worker_args):
-                temp_file, articles, numbers, timings = result
-                
-                if enable_benchmarking and timings:
-                    all_timings.append(timings)
-                
-                if temp_file:
-                    temp_files.append(temp_file)
-                    # Extract chunk_id from result
-                    chunk_id = int(temp_file.stem.split('_')[1])
-                    state_manager.mark_chunk_completed(chunk_id, articles, numbers)
-                
-                progress.advance(task)
+        chunksize = get_chunksize(len(worker_args), num_workers)
+        with get_pool_context().Pool(
+            processes=num_workers,
+            initializer=init_worker,
+            initargs=(dump_path, temp_dir, enable_benchmarking, strict),
+            maxtasksperchild=WORKER_MAX_TASKS
+        ) as pool:
+            # Each completion is appended to the state log; the snapshot is
+            # rewritten (compacting the log) every STATE_SAVE_INTERVAL
+            # completions and once more when the loop ends or is interrupted
+            unsaved = 0
+            try:
+                for result in pool.imap_unordered(worker_wrapper, worker_args, chunksize=chunksize):
+                    temp_file, articles, numbers, timings = result
+                    
+                    if enable_benchmarking and timings:
+                        all_timings.append(timings)
+                    
+                    if temp_file:
+                        # Extract chunk_id from result
+                        chunk_id = int(temp_file.stem.split('_')[1])
+                        state_manager.mark_chunk_completed(chunk_id, articles, numbers)
+                        unsaved += 1
+                        if unsaved >= STATE_SAVE_INTERVAL:
+                            state_manager.save(state_manager.state)
+                            unsaved = 0
+                    
+                    progress.advance(task)
+            finally:
+                if unsaved:
+                    state_manager.save(state_manager.state)
     
     console.print()
     console.print("[green]✓ Processing complete![/green]")
@@ -479,7 +625,13 @@ def process_wikipedia(
     display_progress_table(state)
     console.print()
     
-    # Merge files
+    # Merge files. Every completed chunk is included, not just those finished
+    # in this run: chunks from an interrupted earlier run are still waiting
+    # in temp_dir. Chunk order keeps the output in dump order.
+    temp_files = [
+        chunk_output_path(temp_dir, chunk_id)
+        for chunk_id in sorted(state.completed_chunks)
+    ]
     merge_parquet_files(temp_files, output_path)
     
     # Generate summary
@@ -488,7 +640,12 @@ def process_wikipedia(
         generate_summary(output_path, summary_path)
 
 
-def quick_validate(dump_path: Path, index_path: Path, sample_size: int = 1000):
+def quick_validate(
+    dump_path: Path,
+    index_path: Path,
+    sample_size: int = 1000,
+    strict: bool = False
+):
     """
     Quick validation on a sample of articles.
     
@@ -496,6 +653,7 @@ def quick_validate(dump_path: Path, index_path: Path, sample_size: int = 1000):
         dump_path: Path to Wikipedia dump
         index_path: Path to index file
         sample_size: Number of articles to sample
+        strict: Strip markup with mwparserfromhell instead of the fast regex pass
     """
     console.print(f"[bold cyan]Quick Validation - Testing on {sample_size} articles[/bold cyan]")
     console.print()
@@ -508,14 +666,14 @@ def quick_validate(dump_path: Path, index_path: Path, sample_size: int = 1000):
     
     # Get the offset right after our sample for proper boundary
     if len(entries) > sample_size:
-        next_offset = entries[sample_size][0]
+        next_offset = int(entries.offsets[sample_size])
         # Manually create chunk with proper end offset
-        offsets = sorted(set(e[0] for e in sample_entries))
-        article_ids = [e[1] for e in sample_entries]
+        start_offset = int(sample_entries.offsets.min())
+        article_ids = sample_entries.article_ids
         
         chunks = [{
             'chunk_id': 0,
-            'start_offset': offsets[0],
+            'start_offset': start_offset,
             'end_offset': next_offset,  # Use next article's offset as boundary
             'article_ids': article_ids,
             'article_count': len(article_ids)
@@ -538,13 +696,14 @@ def quick_validate(dump_path: Path, index_path: Path, sample_size: int = 1000):
     # Process chunk
     console.print("[cyan]Processing sample...[/cyan]")
     
-    temp_file, articles, numbers = process_chunk_with_retry(
+    temp_file, articles, numbers, _ = process_chunk_with_retry(
         chunk_id=0,
         dump_path=dump_path,
         temp_dir=temp_dir,
         start_offset=chunk['start_offset'],
         end_offset=chunk['end_offset'],
-        article_ids=chunk['article_ids']
+        article_ids=chunk['article_ids'],
+        strict=strict
     )
     
     if not temp_file or not temp_file.exists():
@@ -568,7 +727,7 @@ def quick_validate(dump_path: Path, index_path: Path, sample_size: int = 1000):
     console.print()
     
     # Show first digit distribution
-    digit_dist = df.group_by('first_digit').agg(pl.count()).sort('first_digit')
+    digit_counts = digit_histogram(df)
     
     table2 = Table(title="First Digit Distribution (Sample)")
     table2.add_column("Digit", style="cyan")
@@ -580,11 +739,9 @@ def quick_validate(dump_path: Path, index_path: Path, sample_size: int = 1000):
                6: 0.067, 7: 0.058, 8: 0.051, 9: 0.046}
     
     total = numbers
-    for row in digit_dist.iter_rows(named=True):
-        digit = row['first_digit']
-        count = row['count']
+    for digit, count in enumerate(digit_counts.tolist(), start=1):
         freq = count / total
-        expected = benford.get(digit, 0)
+        expected = benford[digit]
         
         table2.add_row(
             str(digit),
@@ -679,6 +836,11 @@ def main():
         action="store_true",
         help="Enable detailed timing benchmarks"
     )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Strip markup with mwparserfromhell (slower, for validating the fast path)"
+    )
     
     args = parser.parse_args()
     
@@ -701,7 +863,7 @@ def main():
     # Run validation or full processing
     try:
         if args.test or args.quick_validate:
-            quick_validate(args.dump, args.index)
+            quick_validate(args.dump, args.index, strict=args.strict)
         else:
             process_wikipedia(
                 dump_path=args.dump,
@@ -714,7 +876,8 @@ def main():
                 sample_count=args.sample_count,
                 sample_seed=args.sample_seed,
                 consecutive=args.consecutive,
-                enable_benchmarking=args.benchmark
+                enable_benchmarking=args.benchmark,
+                strict=args.strict
             )
         
         return 0
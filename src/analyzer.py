@@ -5,7 +5,7 @@ Statistical analysis and visualization for Benford's Law validation.
 import polars as pl
 import numpy as np
 from scipy import stats
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 import matplotlib.pyplot as plt
 import matplotlib
 from pathlib import Path
@@ -26,10 +26,34 @@ BENFORD_EXPECTED = {
     9: 0.046
 }
 
+# The same distribution as an array indexed by digit - 1
+BENFORD_EXP_ARR = np.array([BENFORD_EXPECTED[d] for d in range(1, 10)], dtype=np.float64)
 
-def load_data(parquet_path: Path) -> pl.DataFrame:
-    """Load the numbers parquet file."""
-    return pl.read_parquet(parquet_path)
+
+# Columns needed for the analysis; the remaining columns are never loaded
+ANALYSIS_COLUMNS = ["domain", "first_digit"]
+
+
+def load_data(parquet_path: Path, columns: Optional[List[str]] = None) -> pl.DataFrame:
+    """
+    Load the numbers parquet file.
+    
+    Only the requested columns (ANALYSIS_COLUMNS by default) are read,
+    through Polars' streaming engine so the file is decoded batch by batch
+    instead of all at once. Domain and digit columns are narrowed to
+    compact types as they are loaded.
+    """
+    if columns is None:
+        columns = ANALYSIS_COLUMNS
+    
+    narrow = {"domain": pl.Categorical, "first_digit": pl.UInt8, "second_digit": pl.UInt8}
+    
+    return (
+        pl.scan_parquet(parquet_path)
+        .select(columns)
+        .with_columns([pl.col(c).cast(t) for c, t in narrow.items() if c in columns])
+        .collect(engine="streaming")
+    )
 
 
 def calculate_frequencies(df: pl.DataFrame, domain: str = None) -> Dict[int, float]:
@@ -47,7 +71,7 @@ def calculate_frequencies(df: pl.DataFrame, domain: str = None) -> Dict[int, flo
         df = df.filter(pl.col("domain") == domain)
     
     # Count first digits
-    counts = df.group_by("first_digit").agg(pl.count()).sort("first_digit")
+    counts = df.group_by("first_digit").agg(pl.len().alias("count")).sort("first_digit")
     
     total = counts["count"].sum()
     frequencies = {}
@@ -65,6 +89,48 @@ def calculate_frequencies(df: pl.DataFrame, domain: str = None) -> Dict[int, flo
     return frequencies
 
 
+def digit_counts_by_domain(df: pl.DataFrame) -> Tuple[List[str], np.ndarray]:
+    """
+    Count first digits for every domain in a single aggregation.
+    
+    Args:
+        df: DataFrame with number data
+        
+    Returns:
+        Tuple of (sorted domain names, counts matrix of shape
+        (n_domains, 10) indexed by [domain, digit])
+    """
+    counts = df.group_by(["domain", "first_digit"]).agg(pl.len().alias("count"))
+    
+    domains = sorted(counts["domain"].unique().to_list())
+    domain_index = {domain: i for i, domain in enumerate(domains)}
+    
+    rows = np.array([domain_index[d] for d in counts["domain"].to_list()], dtype=np.intp)
+    digits = counts["first_digit"].to_numpy().astype(np.intp)
+    
+    matrix = np.zeros((len(domains), 10), dtype=np.int64)
+    np.add.at(matrix, (rows, digits), counts["count"].to_numpy())
+    
+    return domains, matrix
+
+
+def all_frequencies(df: pl.DataFrame) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Calculate observed first digit frequencies for every domain at once.
+    
+    Args:
+        df: DataFrame with number data
+        
+    Returns:
+        Tuple of (sorted domain names, frequency matrix of shape
+        (n_domains, 9) for digits 1-9, sample count per domain)
+    """
+    domains, counts = digit_counts_by_domain(df)
+    n_samples = counts.sum(axis=1)
+    frequencies = counts[:, 1:] / n_samples[:, None]
+    return domains, frequencies, n_samples
+
+
 def chi_square_test(observed: Dict[int, float], n_samples: int) -> Tuple[float, float]:
     """
     Perform chi-square goodness of fit test.
@@ -77,7 +143,7 @@ def chi_square_test(observed: Dict[int, float], n_samples: int) -> Tuple[float,
         Tuple of (chi_square_statistic, p_value)
     """
     observed_counts = np.array([observed.get(d, 0) * n_samples for d in range(1, 10)])
-    expected_counts = np.array([BENFORD_EXPECTED[d] * n_samples for d in range(1, 10)])
+    expected_counts = BENFORD_EXP_ARR * n_samples
     
     # Chi-square test
     chi2, p_value = stats.chisquare(observed_counts, expected_counts)
@@ -85,6 +151,32 @@ def chi_square_test(observed: Dict[int, float], n_samples: int) -> Tuple[float,
     return chi2, p_value
 
 
+def chi_square_tests(frequencies: np.ndarray, n_samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Perform chi-square goodness of fit tests for many rows at once.
+    
+    Computes sum((O - E)^2 / E) directly over the whole matrix and all
+    p-values in a single chi2.sf call, instead of one scipy.stats.chisquare
+    call per row.
+    
+    Args:
+        frequencies: Observed frequencies, shape (n, 9) for digits 1-9
+        n_samples: Number of samples per row, shape (n,)
+        
+    Returns:
+        Tuple of (chi_square_statistics, p_values), one per row
+    """
+    n_samples = np.asarray(n_samples, dtype=np.float64)[:, None]
+    
+    observed_counts = frequencies * n_samples
+    expected_counts = BENFORD_EXP_ARR * n_samples
+    
+    chi2 = ((observed_counts - expected_counts) ** 2 / expected_counts).sum(axis=1)
+    p_values = stats.chi2.sf(chi2, df=len(BENFORD_EXP_ARR) - 1)
+    
+    return chi2, p_values
+
+
 def mean_absolute_deviation(observed: Dict[int, float]) -> float:
     """
     Calculate Mean Absolute Deviation from Benford distribution.
@@ -95,13 +187,9 @@ def mean_absolute_deviation(observed: Dict[int, float]) -> float:
     Returns:
         MAD value
     """
-    deviations = []
-    for d in range(1, 10):
-        expected = BENFORD_EXPECTED[d]
-        obs = observed.get(d, 0)
-        deviations.append(abs(obs - expected))
+    obs_values = np.array([observed.get(d, 0) for d in range(1, 10)])
     
-    return np.mean(deviations)
+    return np.mean(np.abs(obs_values - BENFORD_EXP_ARR))
 
 
 def kolmogorov_smirnov_test(observed: Dict[int, float]) -> Tuple[float, float]:
@@ -115,7 +203,7 @@ def kolmogorov_smirnov_test(observed: Dict[int, float]) -> Tuple[float, float]:
         Tuple of (KS_statistic, p_value)
     """
     obs_values = [observed.get(d, 0) for d in range(1, 10)]
-    exp_values = [BENFORD_EXPECTED[d] for d in range(1, 10)]
+    exp_values = BENFORD_EXP_ARR
     
     # Cumulative distributions
     obs_cum = np.cumsum(obs_values)
@@ -130,6 +218,25 @@ def kolmogorov_smirnov_test(observed: Dict[int, float]) -> Tuple[float, float]:
     return ks_stat, p_value
 
 
+def deviation_statistics(frequencies: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate MAD and KS statistics for many frequency vectors at once.
+    
+    Vectorized over rows, so all domains are handled in a few array
+    operations instead of one Python call per domain.
+    
+    Args:
+        frequencies: Observed frequencies, shape (n, 9) for digits 1-9
+        
+    Returns:
+        Tuple of (MAD per row, KS statistic per row)
+    """
+    mad = np.abs(frequencies - BENFORD_EXP_ARR).mean(axis=1)
+    ks_stat = np.abs(np.cumsum(frequencies, axis=1) - np.cumsum(BENFORD_EXP_ARR)).max(axis=1)
+    
+    return mad, ks_stat
+
+
 def plot_domain_comparison(df: pl.DataFrame, output_dir: Path):
     """
     Create bar chart comparing observed vs expected for each domain.
@@ -140,8 +247,8 @@ def plot_domain_comparison(df: pl.DataFrame, output_dir: Path):
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Get unique domains
-    domains = df["domain"].unique().to_list()
+    # Frequencies for all domains in one pass
+    domains, frequencies, n_samples_all = all_frequencies(df)
     
     # Create subplot for each domain
     n_domains = len(domains)
@@ -155,17 +262,13 @@ def plot_domain_comparison(df: pl.DataFrame, output_dir: Path):
         axes = axes.flatten()
     
     digits = list(range(1, 10))
-    expected = [BENFORD_EXPECTED[d] for d in digits]
+    expected = BENFORD_EXP_ARR
     
-    for idx, domain in enumerate(sorted(domains)):
+    for idx, domain in enumerate(domains):
         ax = axes[idx]
         
-        # Calculate observed frequencies
-        freq = calculate_frequencies(df, domain)
-        observed = [freq[d] for d in digits]
-        
-        # Count samples
-        n_samples = df.filter(pl.col("domain") == domain).height
+        observed = frequencies[idx]
+        n_samples = n_samples_all[idx]
         
         # Plot
         x = np.arange(len(digits))
@@ -203,17 +306,11 @@ def plot_deviation_heatmap(df: pl.DataFrame, output_dir: Path):
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    domains = sorted(df["domain"].unique().to_list())
     digits = list(range(1, 10))
     
     # Calculate deviations
-    deviation_matrix = []
-    for domain in domains:
-        freq = calculate_frequencies(df, domain)
-        deviations = [freq[d] - BENFORD_EXPECTED[d] for d in digits]
-        deviation_matrix.append(deviations)
-    
-    deviation_matrix = np.array(deviation_matrix)
+    domains, frequencies, _ = all_frequencies(df)
+    deviation_matrix = frequencies - BENFORD_EXP_ARR
     
     # Create heatmap
     fig, ax = plt.subplots(figsize=(10, len(domains) * 0.5 + 2))
@@ -256,20 +353,17 @@ def generate_summary_table(df: pl.DataFrame) -> pl.DataFrame:
     Returns:
         Summary DataFrame
     """
-    domains = sorted(df["domain"].unique().to_list())
+    domains, frequencies, n_samples_all = all_frequencies(df)
+    chi2_all, p_value_all = chi_square_tests(frequencies, n_samples_all)
+    mad_all, _ = deviation_statistics(frequencies)
     
     results = []
-    for domain in domains:
-        domain_df = df.filter(pl.col("domain") == domain)
-        n_samples = domain_df.height
-        
+    for domain, n_samples, chi2, p_value, mad in zip(
+        domains, n_samples_all.tolist(), chi2_all.tolist(), p_value_all.tolist(), mad_all.tolist()
+    ):
         if n_samples == 0:
             continue
         
-        freq = calculate_frequencies(df, domain)
-        chi2, p_value = chi_square_test(freq, n_samples)
-        mad = mean_absolute_deviation(freq)
-        
         results.append({
             "Domain": domain,
             "Samples": n_samples,
@@ -309,6 +403,7 @@ def analyze(parquet_path: Path, output_dir: Path):
     print()
     
     # Save summary
+    output_dir.mkdir(parents=True, exist_ok=True)
     summary_path = output_dir / "summary_statistics.csv"
     summary.write_csv(summary_path)
     print(f"✓ Saved: {summary_path}")
@@ -339,7 +434,7 @@ if __name__ == "__main__":
     digits = np.random.choice(
         list(range(1, 10)),
         size=n_samples,
-        p=[BENFORD_EXPECTED[d] for d in range(1, 10)]
+        p=BENFORD_EXP_ARR
     )
     
     sample_df = pl.DataFrame({
@@ -4,6 +4,9 @@ Maps infobox templates to broad domain categories.
 """
 
 import re
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
 from typing import Optional
 import mwparserfromhell
 
@@ -201,6 +204,9 @@ INFOBOX_MAPPINGS = {
     ],
 }
 
+# All domain categories an article can be assigned to
+DOMAINS = tuple(INFOBOX_MAPPINGS) + ("Uncategorized",)
+
 # Compile regex patterns for each domain (case insensitive)
 # Use word boundaries to avoid partial matches (e.g., "element" in "election")
 DOMAIN_PATTERNS = {}
@@ -209,43 +215,71 @@ for domain, keywords in INFOBOX_MAPPINGS.items():
     pattern = "|".join(r"\b" + re.escape(kw) + r"\b" for kw in keywords)
     DOMAIN_PATTERNS[domain] = re.compile(pattern, re.IGNORECASE)
 
+# Distinct infobox types to remember domains for. Articles reuse a small
+# vocabulary of types, so nearly every lookup skips the pattern scans.
+INFOBOX_CACHE_SIZE = 4096
+
+# Opening of an infobox template ("{{Infobox settlement |..."), capturing
+# the rest of the template name; "{{{" starts a parameter, not a template
+INFOBOX_HEADER_PATTERN = re.compile(r'(?<!\{)\{\{\s*infobox([^|{}]*)', re.IGNORECASE)
+
+# Innermost template ({{...}} without nested braces); applied repeatedly
+# until no templates remain so that nested templates are removed too
+TEMPLATE_PATTERN = re.compile(rb'\{\{[^{}]*\}\}')
+
+# Markup removed by the fast strip path, applied in order after templates.
+# Table cell contents are kept since they hold many of an article's numbers.
+WIKITEXT_STRIP_PATTERNS = [
+    # Comments and references
+    (re.compile(rb'<!--.*?-->', re.DOTALL), b''),
+    (re.compile(rb'<ref[^>]*/>', re.IGNORECASE), b''),
+    (re.compile(rb'<ref[^>]*>.*?</ref>', re.DOTALL | re.IGNORECASE), b''),
+    # Table markup: start/end/row lines, then cell separators together with
+    # any "attrs |" prefix (colspan="2", width=30%, ...) before the content
+    (re.compile(rb'^[ \t]*(?:\{\||\|\}|\|-).*$', re.MULTILINE), b''),
+    (re.compile(rb'(?:^[ \t]*[|!]|\|\||!!)(?:(?:[^|!\[\n]|!(?!!))*\|(?!\|))?', re.MULTILINE), b' '),
+    # Internal links keep their label, external links keep their text
+    (re.compile(rb'\[\[(?:[^\]|]*\|)?([^\]]*)\]\]'), rb'\1'),
+    (re.compile(rb'\[https?://[^\s\]]*\s?([^\]]*)\]'), rb'\1'),
+    # Remaining HTML tags and entities
+    (re.compile(rb'<[^>]+>'), b''),
+    (re.compile(rb'&#?[a-zA-Z0-9]+;'), b' '),
+    # Headings, list markers and bold/italic quotes
+    (re.compile(rb'^(=+)[ \t]*(.*?)[ \t]*\1[ \t]*$', re.MULTILINE), rb' \2 '),
+    (re.compile(rb'^[*#:;]+', re.MULTILINE), b' '),
+    (re.compile(rb"'{2,}"), b''),
+]
+
 
 def extract_infobox_type(wikitext: str) -> Optional[str]:
     """
     Extract the infobox type from Wikipedia wikitext.
 
+    Scans for infobox template headers with a regex rather than parsing the
+    whole article into a template tree, since only the first name is needed.
+
     Args:
         wikitext: Raw Wikipedia markup
 
     Returns:
         Infobox type string (e.g., "settlement", "person") or None
     """
-    try:
-        # Parse wikitext
-        parsed = mwparserfromhell.parse(wikitext)
-
-        # Find templates that look like infoboxes
-        for template in parsed.filter_templates():
-            name = str(template.name).strip().lower()
-
-            # Check if it's an infobox
-            if name.startswith("infobox"):
-                # Extract the type after "infobox "
-                infobox_type = name[7:].strip()  # Remove "infobox" prefix
-                if infobox_type:
-                    return infobox_type
-
-        return None
+    for match in INFOBOX_HEADER_PATTERN.finditer(wikitext):
+        # Extract the type after "infobox "
+        infobox_type = match.group(1).strip().lower()
+        if infobox_type:
+            return infobox_type
 
-    except Exception:
-        # If parsing fails, return None
-        return None
+    return None
 
 
+@lru_cache(maxsize=INFOBOX_CACHE_SIZE)
 def categorize_by_infobox(infobox_type: Optional[str]) -> str:
     """
     Map an infobox type to a broad domain category.
 
+    Results are memoized per infobox type.
+
     Args:
         infobox_type: The infobox type string
 
@@ -277,9 +311,46 @@ def get_domain(wikitext: str) -> str:
     return categorize_by_infobox(infobox_type)
 
 
-def strip_wikitext(wikitext: str) -> str:
+def strip_wikitext_bytes(wikitext_bytes: bytes) -> bytes:
     """
-    Strip Wikipedia markup to get plain text for number extraction.
+    Strip Wikipedia markup from raw bytes with pre-compiled regexes.
+
+    Much faster than building a full mwparserfromhell AST, at the cost of
+    some fidelity on unusual markup.
+
+    Args:
+        wikitext_bytes: Raw Wikipedia markup as UTF-8 bytes
+
+    Returns:
+        Plain text bytes with markup removed
+    """
+    text = wikitext_bytes
+
+    # Remove templates from the inside out
+    previous = None
+    while previous != text:
+        previous = text
+        text = TEMPLATE_PATTERN.sub(b'', text)
+
+    for pattern, replacement in WIKITEXT_STRIP_PATTERNS:
+        text = pattern.sub(replacement, text)
+
+    return text
+
+
+# Bounded LRU of strict-mode parses, keyed by a digest of the article text
+# so memory is spent on results rather than on holding the inputs alive
+STRICT_CACHE_SIZE = 4096
+_strict_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+# Characters the parser can treat as markup, and line-start list, table
+# and rule markers. Text without any of these parses to plain text nodes.
+STRICT_MARKUP_PATTERN = re.compile(r"[{}\[\]<>&'|=~_]|^[ \t]*[*#:;!-]", re.MULTILINE)
+
+
+def _strip_wikitext_strict(wikitext: str) -> str:
+    """
+    Run the full mwparserfromhell strip, memoized on the article hash.
 
     Args:
         wikitext: Raw Wikipedia markup
@@ -287,12 +358,50 @@ def strip_wikitext(wikitext: str) -> str:
     Returns:
         Plain text with markup removed
     """
+    # Nothing for the parser to strip; only apply strip_code's whitespace
+    # collapsing (outer newlines removed, 3+ newlines become 2)
+    if not STRICT_MARKUP_PATTERN.search(wikitext):
+        text = wikitext.strip("\n")
+        while "\n\n\n" in text:
+            text = text.replace("\n\n\n", "\n\n")
+        return text
+
+    key = blake2b(wikitext.encode('utf-8', errors='surrogatepass'), digest_size=16).digest()
+    cached = _strict_cache.get(key)
+    if cached is not None:
+        _strict_cache.move_to_end(key)
+        return cached
+
     try:
         parsed = mwparserfromhell.parse(wikitext)
-        return parsed.strip_code()
+        text = parsed.strip_code()
     except Exception:
         # If parsing fails, return original text
-        return wikitext
+        text = wikitext
+
+    _strict_cache[key] = text
+    if len(_strict_cache) > STRICT_CACHE_SIZE:
+        _strict_cache.popitem(last=False)
+    return text
+
+
+def strip_wikitext(wikitext: str, strict: bool = False) -> str:
+    """
+    Strip Wikipedia markup to get plain text for number extraction.
+
+    Args:
+        wikitext: Raw Wikipedia markup
+        strict: Use the full mwparserfromhell parser instead of the fast
+            regex pass (slower, mainly for validation)
+
+    Returns:
+        Plain text with markup removed
+    """
+    if not strict:
+        text_bytes = strip_wikitext_bytes(wikitext.encode('utf-8', errors='ignore'))
+        return text_bytes.decode('utf-8', errors='ignore')
+
+    return _strip_wikitext_strict(wikitext)
 
 
 # Test function
@@ -12,6 +12,23 @@ import tempfile
 import os
 
 
+def sync_file(f) -> None:
+    """
+    Flush a file and force its data to disk.
+
+    Uses fdatasync where available, which skips metadata such as timestamps
+    that do not matter for recovery, and fsync elsewhere (e.g. Windows).
+
+    Args:
+        f: Open binary file object
+    """
+    f.flush()
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(f.fileno())
+    else:
+        os.fsync(f.fileno())
+
+
 @dataclass
 class ProcessingState:
     """State of the Wikipedia processing job."""
@@ -19,18 +36,17 @@ class ProcessingState:
     version: int = 1
     started_at: str = ""
     total_chunks: int = 0
-    completed_chunks: List[int] = None
+    completed_chunks: Set[int] = None
     failed_chunks: Dict[int, Dict[str, Any]] = None
-    in_progress_chunks: List[int] = None
+    in_progress_chunks: Set[int] = None
     stats: Dict[str, int] = None
 
     def __post_init__(self):
-        if self.completed_chunks is None:
-            self.completed_chunks = []
+        # Chunk ID collections are sets in memory (stored as sorted lists)
+        self.completed_chunks = set(self.completed_chunks or ())
         if self.failed_chunks is None:
             self.failed_chunks = {}
-        if self.in_progress_chunks is None:
-            self.in_progress_chunks = []
+        self.in_progress_chunks = set(self.in_progress_chunks or ())
         if self.stats is None:
             self.stats = {"articles": 0, "numbers": 0}
         if not self.started_at:
@@ -38,7 +54,15 @@ class ProcessingState:
 
 
 class StateManager:
-    """Manages processing state with atomic file operations."""
+    """
+    Manages processing state with atomic file operations.
+
+    The state is kept as a JSON snapshot plus an append-only log of chunk
+    events (one JSON line each) next to it. Marking a chunk appends a short
+    line instead of rewriting the whole state; save() writes a new snapshot
+    and starts an empty log, load() replays the log over the snapshot in
+    memory, and compact() folds the replayed log into a new snapshot.
+    """
 
     def __init__(self, state_path: Path):
         """
@@ -49,12 +73,20 @@ class StateManager:
         """
         self.state_path = state_path
         self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.log_path = state_path.with_suffix(".log")
         self._state: Optional[ProcessingState] = None
+        self._log = None
+        # End of the last complete log line, if load() found a torn one
+        self._log_end: Optional[int] = None
 
     def load(self) -> ProcessingState:
         """
         Load state from disk or create new state.
 
+        Only reads: logged events are replayed over the snapshot in memory
+        and the files are left as they are. Call compact() to write them
+        into a new snapshot.
+
         Returns:
             ProcessingState object
         """
@@ -63,7 +95,8 @@ class StateManager:
                 with open(self.state_path, "rb") as f:
                     data = orjson.loads(f.read())
                     self._state = ProcessingState(**data)
-                    return self._state
+                self._replay_log()
+                return self._state
             except Exception as e:
                 print(f"Warning: Could not load state file: {e}")
                 print("Starting fresh...")
@@ -74,7 +107,7 @@ class StateManager:
 
     def save(self, state: ProcessingState) -> bool:
         """
-        Atomically save state to disk.
+        Atomically save a state snapshot to disk and reset the event log.
 
         Args:
             state: ProcessingState to save
@@ -82,35 +115,131 @@ class StateManager:
         Returns:
             True if successful
         """
-        try:
-            self._state = state
+        self._state = state
 
-            # Write to temporary file first
-            with tempfile.NamedTemporaryFile(
-                mode="wb", dir=self.state_path.parent, delete=False
-            ) as tmp_file:
-                tmp_path = Path(tmp_file.name)
-                tmp_file.write(orjson.dumps(asdict(state), option=orjson.OPT_INDENT_2))
+        data = asdict(state)
+        data["completed_chunks"] = sorted(state.completed_chunks)
+        data["in_progress_chunks"] = sorted(state.in_progress_chunks)
+        if not atomic_write_file(self.state_path, orjson.dumps(data)):
+            return False
 
-            # Atomic rename (POSIX guarantees atomicity)
-            os.replace(tmp_path, self.state_path)
-            return True
+        # The snapshot now holds every logged event. Replaying them again
+        # after a crash right here is harmless (see _apply).
+        self._close_log()
+        self.log_path.unlink(missing_ok=True)
+        self._log_end = None
+        return True
+
+    def compact(self) -> bool:
+        """
+        Write the loaded state, including replayed events, as a new snapshot.
+
+        Returns:
+            True if successful
+        """
+        if not self._state:
+            return False
+
+        return self.save(self._state)
+
+    def _replay_log(self):
+        """Apply the events logged since the last snapshot."""
+        self._log_end = None
+        if not self.log_path.exists():
+            return
+
+        offset = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                event = None
+                if line.endswith(b"\n"):
+                    try:
+                        event = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        pass
+                if event is None:
+                    # Torn final line from a crash mid-write; cut it off
+                    # before the next append (see _record)
+                    self._log_end = offset
+                    break
+                self._apply(event)
+                offset += len(line)
+
+    def _record(self, event: Dict[str, Any]) -> bool:
+        """
+        Apply an event to the in-memory state and append it to the log.
+
+        Args:
+            event: Event dict with "op" and "chunk" keys
 
+        Returns:
+            True if successful
+        """
+        self._apply(event)
+
+        try:
+            if self._log is None:
+                self._log = open(self.log_path, "ab")
+                if self._log_end is not None:
+                    self._log.truncate(self._log_end)
+                    self._log_end = None
+            self._log.write(orjson.dumps(event) + b"\n")
+            sync_file(self._log)
+            return True
         except Exception as e:
-            print(f"Error saving state: {e}")
-            if "tmp_path" in locals() and tmp_path.exists():
-                tmp_path.unlink()
+            print(f"Error writing state log: {e}")
             return False
 
+    def _close_log(self):
+        """Close the event log file if it is open."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _apply(self, event: Dict[str, Any]):
+        """
+        Apply one chunk event to the state.
+
+        Events are idempotent, so one replayed over a snapshot that already
+        includes it changes nothing.
+
+        Args:
+            event: Event dict with "op" and "chunk" keys
+        """
+        chunk_id = event["chunk"]
+        op = event["op"]
+
+        if op == "started":
+            self._state.in_progress_chunks.add(chunk_id)
+            return
+
+        # Remove from in_progress
+        self._state.in_progress_chunks.discard(chunk_id)
+
+        if op == "completed":
+            # Add to completed, counting its stats once
+            if chunk_id not in self._state.completed_chunks:
+                self._state.completed_chunks.add(chunk_id)
+                self._state.stats["articles"] += event["articles"]
+                self._state.stats["numbers"] += event["numbers"]
+
+            # Remove from failed if it was there (check string key)
+            self._state.failed_chunks.pop(str(chunk_id), None)
+
+        elif op == "failed":
+            # Add to failed (use string key for JSON serialization)
+            self._state.failed_chunks[str(chunk_id)] = {
+                "error": event["error"],
+                "retries": event["retries"],
+                "failed_at": event["failed_at"],
+            }
+
     def mark_chunk_started(self, chunk_id: int) -> bool:
         """Mark a chunk as in progress."""
         if not self._state:
             return False
 
-        if chunk_id not in self._state.in_progress_chunks:
-            self._state.in_progress_chunks.append(chunk_id)
-
-        return self.save(self._state)
+        return self._record({"op": "started", "chunk": chunk_id})
 
     def mark_chunk_completed(self, chunk_id: int, articles: int, numbers: int) -> bool:
         """
@@ -127,23 +256,12 @@ class StateManager:
         if not self._state:
             return False
 
-        # Remove from in_progress
-        if chunk_id in self._state.in_progress_chunks:
-            self._state.in_progress_chunks.remove(chunk_id)
-
-        # Add to completed
-        if chunk_id not in self._state.completed_chunks:
-            self._state.completed_chunks.append(chunk_id)
-
-        # Remove from failed if it was there (check string key)
-        if str(chunk_id) in self._state.failed_chunks:
-            del self._state.failed_chunks[str(chunk_id)]
-
-        # Update stats
-        self._state.stats["articles"] += articles
-        self._state.stats["numbers"] += numbers
-
-        return self.save(self._state)
+        return self._record({
+            "op": "completed",
+            "chunk": chunk_id,
+            "articles": articles,
+            "numbers": numbers,
+        })
 
     def mark_chunk_failed(self, chunk_id: int, error: str, retries: int = 0) -> bool:
         """
@@ -160,27 +278,20 @@ class StateManager:
         if not self._state:
             return False
 
-        # Remove from in_progress
-        if chunk_id in self._state.in_progress_chunks:
-            self._state.in_progress_chunks.remove(chunk_id)
-
-        # Add to failed (use string key for JSON serialization)
-        self._state.failed_chunks[str(chunk_id)] = {
+        return self._record({
+            "op": "failed",
+            "chunk": chunk_id,
             "error": str(error),
             "retries": retries,
             "failed_at": datetime.utcnow().isoformat() + "Z",
-        }
-
-        return self.save(self._state)
+        })
 
     def get_pending_chunks(self) -> Set[int]:
         """Get set of chunk IDs that still need processing."""
         if not self._state:
             return set()
 
-        all_chunks = set(range(self._state.total_chunks))
-        completed = set(self._state.completed_chunks)
-        return all_chunks - completed
+        return set(range(self._state.total_chunks)) - self._state.completed_chunks
 
     def get_failed_chunks(self) -> Dict[int, int]:
         """Get dict of failed chunk IDs to retry counts."""
@@ -218,6 +329,8 @@ def atomic_write_file(path: Path, data: bytes) -> bool:
         ) as tmp_file:
             tmp_path = Path(tmp_file.name)
             tmp_file.write(data)
+            # Data must be on disk before the rename makes it visible
+            sync_file(tmp_file)
 
         # Atomic rename
         os.replace(tmp_path, path)
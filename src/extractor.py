@@ -6,20 +6,39 @@ Enhanced with category extraction based on context.
 
 import re
 from typing import List, Tuple, Optional
+import numpy as np
 try:
-    from .number_categorizer import get_categorizer
+    from .number_categorizer import CATEGORIES, get_categorizer
 except ImportError:
     # For standalone testing
-    from number_categorizer import get_categorizer
+    from number_categorizer import CATEGORIES, get_categorizer
+
+
+# Category name -> id, the index into CATEGORIES
+CATEGORY_IDS = {category: i for i, category in enumerate(CATEGORIES)}
 
 
 # Regex pattern for numbers (works on bytes)
 # Matches integers and decimals starting with 1-9, avoids leading zeros
 NUMBER_PATTERN = re.compile(rb'(?<![0-9])[1-9][0-9]{0,15}(?:\.[0-9]+)?(?![0-9])')
 
+# Same pattern for decoded text (used when context is needed)
+NUMBER_PATTERN_STR = re.compile(r'(?<![0-9])[1-9][0-9]{0,15}(?:\.[0-9]+)?(?![0-9])')
+
 # Quick check pattern (faster, for two-pass)
 HAS_NUMBER_PATTERN = re.compile(rb'[1-9]')
 
+# Byte classification table for the vectorized number scanner
+IS_DIGIT_BYTE = np.zeros(256, dtype=bool)
+IS_DIGIT_BYTE[ord('0'):ord('9') + 1] = True
+
+# Exact powers of ten 10^0 .. 10^22 (all representable in float64)
+POWERS_OF_TEN = 10.0 ** np.arange(23)
+
+# Texts at least this long are scanned with find_number_spans; below it the
+# fixed cost of the array operations outweighs the regex engine
+VECTOR_SCAN_MIN_BYTES = 2048
+
 
 def quick_has_numbers(text_bytes: bytes) -> bool:
     """
@@ -45,24 +64,139 @@ def extract_numbers_from_bytes(text_bytes: bytes) -> List[float]:
     Returns:
         List of extracted numbers as floats
     """
-    numbers = []
+    if len(text_bytes) < VECTOR_SCAN_MIN_BYTES:
+        matches = NUMBER_PATTERN.findall(text_bytes)
+    else:
+        starts, ends = find_number_spans(text_bytes)
+        matches = [text_bytes[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
     
-    for match in NUMBER_PATTERN.finditer(text_bytes):
-        try:
-            # Convert bytes to string then to float
-            num_str = match.group(0).decode('utf-8', errors='ignore')
-            # Remove commas if present (e.g., "1,234" -> "1234")
-            num_str = num_str.replace(',', '')
-            number = float(num_str)
-            
-            # Sanity check: must be positive and reasonable
-            if 0 < number < 1e16:
-                numbers.append(number)
-        except (ValueError, UnicodeDecodeError):
-            # Skip malformed numbers
-            continue
+    # Matches are plain ASCII digits (no commas), which float() parses from
+    # bytes directly. They start with 1-9 so are always positive, but a
+    # fraction can round a 16-digit match up to 1e16.
+    return [number for number in map(float, matches) if number < 1e16]
+
+
+def find_number_spans(text_bytes: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find every NUMBER_PATTERN match, without the regex engine.
+    
+    Classifies each byte with a lookup table and works on maximal digit
+    runs. A run is a match if it starts with 1-9 and has at most 16 digits.
+    The exception is a run directly after a match and a single '.': the
+    regex swallows it as the match's fractional part. In chains like
+    "1.2.3" matches and swallowed runs alternate, which is resolved by
+    iterating to a fixed point (one pass per link in the longest chain).
     
-    return numbers
+    Args:
+        text_bytes: Raw bytes of article text
+        
+    Returns:
+        Tuple of (start offsets, end offsets), identical to the spans of
+        NUMBER_PATTERN.finditer(text_bytes)
+    """
+    buf = np.frombuffer(text_bytes, dtype=np.uint8)
+    
+    # Digit run boundaries (padded so runs touching either end close)
+    padded = np.zeros(len(buf) + 2, dtype=bool)
+    padded[1:-1] = IS_DIGIT_BYTE[buf]
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    run_starts = edges[0::2]
+    run_ends = edges[1::2]
+    
+    valid = (buf[run_starts] != ord('0')) & (run_ends - run_starts <= 16)
+    
+    # Run i is separated from run i-1 by exactly one '.'
+    linked = np.zeros(len(run_starts), dtype=bool)
+    linked[1:] = (run_starts[1:] - run_ends[:-1] == 1) & (buf[run_starts[1:] - 1] == ord('.'))
+    
+    is_match = valid
+    while True:
+        swallowed = np.zeros_like(linked)
+        swallowed[1:] = linked[1:] & is_match[:-1]
+        updated = valid & ~swallowed
+        if np.array_equal(updated, is_match):
+            break
+        is_match = updated
+    
+    # A match ends with its own run, or with the next run if that is its
+    # fractional part
+    match_runs = np.flatnonzero(is_match)
+    next_runs = match_runs + 1
+    has_fraction = np.zeros(len(match_runs), dtype=bool)
+    in_bounds = next_runs < len(run_starts)
+    has_fraction[in_bounds] = linked[next_runs[in_bounds]]
+    ends = np.where(has_fraction, run_ends[np.minimum(next_runs, len(run_ends) - 1)], run_ends[match_runs])
+    
+    return run_starts[match_runs], ends
+
+
+def find_number_starts(text_bytes: bytes) -> np.ndarray:
+    """
+    Find where every NUMBER_PATTERN match starts, without the regex engine.
+    
+    Args:
+        text_bytes: Raw bytes of article text
+        
+    Returns:
+        Array of match start offsets, identical to
+        [m.start() for m in NUMBER_PATTERN.finditer(text_bytes)]
+    """
+    return find_number_spans(text_bytes)[0]
+
+
+def find_text_number_spans(text: str, text_bytes: bytes) -> List[Tuple[int, int]]:
+    """
+    Find the character spans of every NUMBER_PATTERN_STR match in text.
+    
+    Long texts are scanned as bytes with find_number_spans. Byte offsets
+    are then mapped to character offsets by counting the bytes that start
+    a UTF-8 character. The mapping is only exact if the bytes were valid
+    UTF-8, since a dropped byte (even a lone continuation byte between
+    digits) can join or split matches, so texts that lost bytes in
+    decoding fall back to the regex, as do short texts.
+    
+    Args:
+        text: Decoded article text
+        text_bytes: UTF-8 bytes that text was decoded from
+        
+    Returns:
+        List of (start, end) character offsets, identical to the spans of
+        NUMBER_PATTERN_STR.finditer(text)
+    """
+    if len(text_bytes) >= VECTOR_SCAN_MIN_BYTES:
+        starts, ends = find_number_spans(text_bytes)
+        
+        if len(text) == len(text_bytes):
+            # ASCII: byte and character offsets coincide
+            return list(zip(starts.tolist(), ends.tolist()))
+        
+        # Decoding dropped nothing if the text re-encodes to the same length
+        if len(text.encode('utf-8', errors='surrogatepass')) == len(text_bytes):
+            buf = np.frombuffer(text_bytes, dtype=np.uint8)
+            starts_char = (buf & 0xC0) != 0x80
+            char_offsets = np.zeros(len(buf) + 1, dtype=np.int64)
+            np.cumsum(starts_char, out=char_offsets[1:])
+            return list(zip(char_offsets[starts].tolist(), char_offsets[ends].tolist()))
+    
+    return [match.span() for match in NUMBER_PATTERN_STR.finditer(text)]
+
+
+def count_leading_digits(text_bytes: bytes) -> np.ndarray:
+    """
+    Count the first digits of all numbers in raw bytes.
+    
+    Every NUMBER_PATTERN match starts with its leading digit (1-9), so the
+    histogram is built from match offsets without parsing any number.
+    
+    Args:
+        text_bytes: Raw bytes of article text
+        
+    Returns:
+        Array of 10 counts indexed by digit (index 0 is always 0)
+    """
+    starts = find_number_starts(text_bytes)
+    buf = np.frombuffer(text_bytes, dtype=np.uint8)
+    return np.bincount(buf[starts] - ord('0'), minlength=10)
 
 
 def extract_numbers_from_text(text: str) -> List[float]:
@@ -111,22 +245,54 @@ def get_second_digit(number: float) -> int:
     Returns:
         Second digit (0-9), or 0 if number has only one digit
     """
-    if number <= 0:
-        return 0
+    return analyze_number(number)[1]
+
+
+def first_two_digits(numbers) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the first and second digits of many numbers at once.
     
-    # Convert to string and get second digit
-    num_str = f"{number:.15g}"
+    Vectorized equivalent of analyze_number for the numbers the extractor
+    produces (1 <= number < 1e16): each number is scaled to a 15-digit
+    significand (matching the '.15g' rounding of get_first_digit) with
+    exact powers of ten, and the digits are read off arithmetically. As in
+    analyze_number, a one-digit significand printed in exponent form
+    (e.g. 3e+15) gets second digit 0 rather than a digit of the exponent.
     
-    # Find first non-zero digit, then get next digit
-    found_first = False
-    for char in num_str:
-        if char.isdigit():
-            if not found_first and char != '0':
-                found_first = True
-            elif found_first:
-                return int(char)
+    Args:
+        numbers: Sequence or array of numbers
+        
+    Returns:
+        Tuple of (first digits, second digits) as uint8 arrays; numbers
+        outside [1, 1e16) get 0 for both
+    """
+    values = np.asarray(numbers, dtype=np.float64)
+    first = np.zeros(len(values), dtype=np.uint8)
+    second = np.zeros(len(values), dtype=np.uint8)
     
-    return 0
+    in_range = (values >= 1) & (values < 1e16)
+    v = values[in_range]
+    
+    # Decimal exponent, corrected where log10 rounds across a power of ten
+    exponent = np.floor(np.log10(v)).astype(np.int64)
+    exponent += v >= POWERS_OF_TEN[np.minimum(exponent + 1, 22)]
+    exponent -= v < POWERS_OF_TEN[exponent]
+    
+    # 15 significant digits as an integer-valued float; rounding can carry
+    # into a 16th digit (999...95 -> 1000...0), which means digits 1 and 0
+    shift = 14 - exponent
+    significand = np.rint(np.where(
+        shift >= 0,
+        v * POWERS_OF_TEN[np.maximum(shift, 0)],
+        v / POWERS_OF_TEN[np.maximum(-shift, 0)]
+    ))
+    significand[significand >= 1e15] = 1e14
+    
+    leading = (significand // 1e13).astype(np.uint8)
+    first[in_range] = leading // 10
+    second[in_range] = leading % 10
+    
+    return first, second
 
 
 def analyze_number(number: float) -> Tuple[int, int]:
@@ -139,7 +305,22 @@ def analyze_number(number: float) -> Tuple[int, int]:
     Returns:
         Tuple of (first_digit, second_digit)
     """
-    return (get_first_digit(number), get_second_digit(number))
+    if number <= 0:
+        return (0, 0)
+    
+    # One format and one scan for both digits. The scan stops at an
+    # exponent, so a one-digit significand (3e+15) has second digit 0.
+    first = 0
+    for char in f"{number:.15g}":
+        if char == 'e':
+            break
+        if char.isdigit():
+            if first:
+                return (first, int(char))
+            if char != '0':
+                first = int(char)
+    
+    return (first, 0)
 
 
 def extract_numbers_with_context(
@@ -166,40 +347,24 @@ def extract_numbers_with_context(
     except Exception:
         return results
     
-    # Re-compile pattern for string (not bytes)
-    pattern = re.compile(r'(?<![0-9])[1-9][0-9]{0,15}(?:\.[0-9]+)?(?![0-9])')
-    
-    categorizer = get_categorizer() if categorize else None
-    
-    for match in pattern.finditer(text):
-        try:
-            num_str = match.group(0)
-            # Remove commas if present
-            clean_num_str = num_str.replace(',', '')
-            number = float(clean_num_str)
-            
-            # Sanity check
-            if not (0 < number < 1e16):
-                continue
-            
-            # Extract context window
-            start_pos = match.start()
-            end_pos = match.end()
-            
-            context_start = max(0, start_pos - context_window)
-            context_end = min(len(text), end_pos + context_window)
-            context = text[context_start:context_end]
-            
-            # Categorize if requested
-            if categorizer:
-                category = categorizer.categorize(num_str, context)
-            else:
-                category = 'generic'
-            
-            results.append((number, category, start_pos, end_pos))
-            
-        except (ValueError, UnicodeDecodeError):
-            continue
+    # Collect all numbers first so they can be categorized in a single batch.
+    # Matches are plain digits (no commas) starting with 1-9, so float()
+    # cannot fail; a fraction can still round a 16-digit match up to 1e16.
+    matches = []
+    for start_pos, end_pos in find_text_number_spans(text, text_bytes):
+        number = float(text[start_pos:end_pos])
+        if number < 1e16:
+            matches.append((number, start_pos, end_pos))
+    
+    # Categorize if requested
+    spans = [(start_pos, end_pos) for _, start_pos, end_pos in matches]
+    if categorize:
+        categories = get_categorizer().categorize_batch(text, spans, context_window)
+    else:
+        categories = ['generic'] * len(spans)
+    
+    for (number, start_pos, end_pos), category in zip(matches, categories):
+        results.append((number, category, start_pos, end_pos))
     
     return results
 
@@ -218,6 +383,91 @@ def extract_categorized_numbers(text_bytes: bytes) -> List[Tuple[float, str]]:
     return [(num, cat) for num, cat, _, _ in results]
 
 
+def _number_category_arrays(
+    text_bytes: bytes,
+    context_window: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract numbers in the sanity range and their category ids.
+    
+    Shared by the array extractors, which differ only in what they return
+    per number.
+    
+    Args:
+        text_bytes: Raw bytes of article text
+        context_window: Number of characters before/after number for context
+        
+    Returns:
+        Tuple of (float64 numbers, uint8 category ids indexing CATEGORIES)
+    """
+    text = text_bytes.decode('utf-8', errors='ignore')
+    spans = find_text_number_spans(text, text_bytes)
+    
+    numbers = np.fromiter(
+        (float(text[start:end]) for start, end in spans),
+        dtype=np.float64,
+        count=len(spans)
+    )
+    
+    # A fraction can round a 16-digit match up to 1e16
+    in_range = numbers < 1e16
+    if not in_range.all():
+        spans = [span for span, keep in zip(spans, in_range.tolist()) if keep]
+        numbers = numbers[in_range]
+    
+    categories = get_categorizer().categorize_batch(text, spans, context_window)
+    category_ids = np.fromiter(
+        (CATEGORY_IDS[category] for category in categories),
+        dtype=np.uint8,
+        count=len(categories)
+    )
+    
+    return numbers, category_ids
+
+
+def extract_digit_category_arrays(
+    text_bytes: bytes,
+    context_window: int = 30
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract leading digits and categories as parallel uint8 arrays.
+    
+    Same numbers and categories as extract_categorized_numbers, but without
+    building a (float, str) tuple per number, so per-article results can be
+    reduced with np.bincount directly.
+    
+    Args:
+        text_bytes: Raw bytes of article text
+        context_window: Number of characters before/after number for context
+        
+    Returns:
+        Tuple of (leading digits 1-9, category ids indexing CATEGORIES)
+    """
+    numbers, category_ids = _number_category_arrays(text_bytes, context_window)
+    return first_two_digits(numbers)[0], category_ids
+
+
+def extract_number_category_arrays(
+    text_bytes: bytes,
+    context_window: int = 30
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract numbers and categories as parallel arrays.
+    
+    Same records as extract_categorized_numbers, but stored as a float64
+    array and a uint8 array of category ids (indexing CATEGORIES) instead
+    of a tuple and a boxed float per number.
+    
+    Args:
+        text_bytes: Raw bytes of article text
+        context_window: Number of characters before/after number for context
+        
+    Returns:
+        Tuple of (numbers, category ids indexing CATEGORIES)
+    """
+    return _number_category_arrays(text_bytes, context_window)
+
+
 # Test function
 if __name__ == "__main__":
     # Test cases
@@ -6,7 +6,9 @@ Performance target: <5ms per article (down from 28ms)
 """
 
 import re
-from typing import Tuple, Optional, Set
+from bisect import bisect_left
+from functools import lru_cache
+from typing import List, Tuple, Optional, Set
 
 
 # =============================================================================
@@ -71,6 +73,62 @@ QUICK_TRIGGER_WORDS = {
 # Convert to lowercase set for fast lookup
 TRIGGER_SET = frozenset(w.lower() for w in QUICK_TRIGGER_WORDS)
 
+# Every category the categorizer can return, in pattern priority order.
+# Used as the dictionary for the number_category column.
+CATEGORIES = (
+    'date_full', 'time', 'coordinates', 'resolution',
+    'distance_astro', 'mass_astro', 'elevation', 'depth', 'area', 'volume',
+    'mass_weight', 'distance', 'temperature', 'speed', 'power', 'energy',
+    'frequency', 'electric', 'pressure', 'file_size', 'bit_rate', 'decibel', 'ph',
+    'money_magnitude', 'money', 'population', 'casualties', 'votes', 'duration',
+    'age', 'record_stat',
+    'percentage', 'score_sports', 'rating', 'ranking', 'chart_position',
+    'richter', 'episode_chapter', 'century_decade', 'jersey_number',
+    'year', 'generic',
+)
+
+
+# Categorized (number, lowercased context) pairs remembered per categorizer.
+# Tables, lists and repeated phrasing produce identical contexts; the cache
+# is simply emptied when full.
+CATEGORY_CACHE_SIZE = 1 << 16
+
+
+class TriggerIndex:
+    """
+    Positions of every trigger word in a lowercased article.
+
+    Built once per article so that each number's context window can be
+    resolved with a bisect instead of rescanning every trigger word.
+    """
+
+    def __init__(self, text_lower: str):
+        hits: List[Tuple[int, int, str]] = []
+        find = text_lower.find
+
+        for trigger in TRIGGER_SET:
+            pos = find(trigger)
+            while pos != -1:
+                hits.append((pos, pos + len(trigger), trigger))
+                pos = find(trigger, pos + 1)
+
+        hits.sort()
+        self._hits = hits
+        self._starts = [hit[0] for hit in hits]
+
+    def window(self, start: int, end: int) -> Set[str]:
+        """Get all trigger words lying entirely within text[start:end]."""
+        hits = self._hits
+        found = set()
+
+        i = bisect_left(self._starts, start)
+        while i < len(hits) and hits[i][0] < end:
+            if hits[i][1] <= end:
+                found.add(hits[i][2])
+            i += 1
+
+        return found
+
 
 # =============================================================================
 # CATEGORY PATTERNS - Organized by trigger group for faster matching
@@ -88,12 +146,16 @@ class OptimizedCategorizer:
     
     def __init__(self):
         self._compile_patterns()
+        self._index_patterns()
+        self._cache = {}
         
     def _compile_patterns(self):
         """Compile all patterns organized by trigger groups."""
         
         # Pattern format: (pattern, category, trigger_words)
         # trigger_words = set of words that must be present for this pattern to run
+        # Patterns are matched against lowercased context, so they are
+        # written in lowercase and compiled without re.I
         
         self.patterns = []
         
@@ -103,7 +165,7 @@ class OptimizedCategorizer:
         
         # Date patterns
         self.patterns.append((
-            re.compile(r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b', re.I),
+            re.compile(r'\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4}\b'),
             'date_full',
             {'jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec',
              'january', 'february', 'march', 'april', 'june', 'july', 'august', 'september', 
@@ -118,21 +180,21 @@ class OptimizedCategorizer:
         
         # Time
         self.patterns.append((
-            re.compile(r'\b\d{1,2}:\d{2}(?::\d{2})?\s?(?:am|pm)?\b', re.I),
+            re.compile(r'\b\d{1,2}:\d{2}(?::\d{2})?\s?(?:am|pm)?\b'),
             'time',
             {':', 'am', 'pm'}
         ))
         
         # Coordinates
         self.patterns.append((
-            re.compile(r'\b\d+\.?\d*\s?°\s?[nsew]\b', re.I),
+            re.compile(r'\b\d+\.?\d*\s?°\s?[nsew]\b'),
             'coordinates',
             {'°', 'latitude', 'longitude', '° n', '° s', '° e', '° w'}
         ))
         
         # Resolution
         self.patterns.append((
-            re.compile(r'\b\d{3,5}\s?[x×]\s?\d{3,5}\b|(?:4k|8k|1080[pi]|720[pi])', re.I),
+            re.compile(r'\b\d{3,5}\s?[x×]\s?\d{3,5}\b|(?:4k|8k|1080[pi]|720[pi])'),
             'resolution',
             {'x', '×', '1080', '720', '4k', '8k', 'resolution'}
         ))
@@ -143,132 +205,132 @@ class OptimizedCategorizer:
         
         # Astronomical distance
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:light-years?|ly|parsecs?|pc|kpc|mpc|au)\b', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:light-years?|ly|parsecs?|pc|kpc|mpc|au)\b'),
             'distance_astro',
             {'light-year', 'parsec', 'au ', 'astronomical', 'ly', 'pc'}
         ))
         
         # Astronomical mass
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:solar mass|earth mass|jupiter mass|m☉|m⊕)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:solar mass|earth mass|jupiter mass|m☉|m⊕)'),
             'mass_astro',
             {'solar mass', 'earth mass', 'jupiter mass', 'm☉', 'm⊕'}
         ))
         
         # Elevation/Depth
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:m|meters?|ft|feet)\s+(?:above sea level|asl)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:m|meters?|ft|feet)\s+(?:above sea level|asl)'),
             'elevation',
             {'above sea level', 'elevation', 'altitude', 'asl'}
         ))
         
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:m|meters?|ft|feet)\s+(?:deep|below|depth)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:m|meters?|ft|feet)\s+(?:deep|below|depth)'),
             'depth',
             {'deep', 'below', 'depth', 'below sea level'}
         ))
         
         # Area
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:km²|km2|m²|mi²|ft²|hectares?|ha\b|acres?|sq\s+(?:km|mi|ft|m))', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:km²|km2|m²|mi²|ft²|hectares?|ha\b|acres?|sq\s+(?:km|mi|ft|m))'),
             'area',
             {'km²', 'm²', 'acre', 'hectare', 'square', 'sq '}
         ))
         
         # Volume
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:liters?|litres?|l\b|ml|gallons?|gal\b)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:liters?|litres?|l\b|ml|gallons?|gal\b)'),
             'volume',
             {'liter', 'litre', 'gallon', 'ml'}
         ))
         
         # Mass/Weight
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kg|kilograms?|g\b|grams?|lbs?|pounds?|tons?|tonnes?|oz|ounces?)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kg|kilograms?|g\b|grams?|lbs?|pounds?|tons?|tonnes?|oz|ounces?)'),
             'mass_weight',
             {'kg', 'lb', 'gram', 'pound', 'ton', 'ounce', 'kilogram'}
         ))
         
         # Distance
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:km|kilometers?|kilometres?|m\b|meters?|metres?|mi\b|miles?|ft|feet|foot|in\b|inches?|yd|yards?)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:km|kilometers?|kilometres?|m\b|meters?|metres?|mi\b|miles?|ft|feet|foot|in\b|inches?|yd|yards?)'),
             'distance',
             {'km', 'mi', 'meter', 'metre', 'feet', 'foot', 'inch', 'yard', 'mile'}
         ))
         
         # Temperature
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:°[cf]|degrees?\s+(?:celsius|fahrenheit)|kelvin|k\b)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:°[cf]|degrees?\s+(?:celsius|fahrenheit)|kelvin|k\b)'),
             'temperature',
             {'°c', '°f', 'celsius', 'fahrenheit', 'kelvin'}
         ))
         
         # Speed
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:km/h|kph|mph|m/s|knots?)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:km/h|kph|mph|m/s|knots?)'),
             'speed',
             {'km/h', 'mph', 'm/s', 'knot', 'kph'}
         ))
         
         # Power
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kw|mw|gw|watts?|horsepower|hp\b)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kw|mw|gw|watts?|horsepower|hp\b)'),
             'power',
             {'kw', 'mw', 'gw', 'watt', 'horsepower', 'hp'}
         ))
         
         # Energy
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kwh|mwh|joules?|calories?|kcal|ev\b|kev|mev|gev)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kwh|mwh|joules?|calories?|kcal|ev\b|kev|mev|gev)'),
             'energy',
             {'kwh', 'joule', 'calorie', 'ev', 'kev', 'mev'}
         ))
         
         # Frequency
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:hz|khz|mhz|ghz|thz)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:hz|khz|mhz|ghz|thz)'),
             'frequency',
             {'hz', 'khz', 'mhz', 'ghz'}
         ))
         
         # Electrical
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:volts?|v\b|amps?|amperes?|a\b|ohms?|Ω|mah)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:volts?|v\b|amps?|amperes?|a\b|ohms?|ω|mah)'),
             'electric',
             {'volt', 'amp', 'ohm', 'mah'}
         ))
         
         # Pressure
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:pa|kpa|mpa|bar|psi|atm)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:pa|kpa|mpa|bar|psi|atm)'),
             'pressure',
             {'pa', 'bar', 'psi', 'atm', 'kpa'}
         ))
         
         # File size
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kb|mb|gb|tb|pb|bytes?)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kb|mb|gb|tb|pb|bytes?)'),
             'file_size',
             {'kb', 'mb', 'gb', 'tb', 'byte'}
         ))
         
         # Bit rate
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kbps|mbps|gbps|bit/s)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:kbps|mbps|gbps|bit/s)'),
             'bit_rate',
             {'kbps', 'mbps', 'gbps'}
         ))
         
         # Decibel
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:db|decibels?)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?(?:db|decibels?)'),
             'decibel',
             {'db', 'decibel'}
         ))
         
         # pH
         self.patterns.append((
-            re.compile(r'\bph\s+(?:of\s+)?(\d+\.?\d*)', re.I),
+            re.compile(r'\bph\s+(?:of\s+)?(\d+\.?\d*)'),
             'ph',
             {'ph '}
         ))
@@ -279,56 +341,56 @@ class OptimizedCategorizer:
         
         # Money with magnitude
         self.patterns.append((
-            re.compile(r'[$€£¥₹]\s?\d[\d,]*\.?\d*\s+(?:thousand|million|billion|trillion)', re.I),
+            re.compile(r'[$€£¥₹]\s?\d[\d,]*\.?\d*\s+(?:thousand|million|billion|trillion)'),
             'money_magnitude',
             {'$', '€', '£', '¥', '₹', 'million', 'billion', 'trillion'}
         ))
         
         # Money
         self.patterns.append((
-            re.compile(r'[$€£¥₹]\s?\d[\d,]*\.?\d*', re.I),
+            re.compile(r'[$€£¥₹]\s?\d[\d,]*\.?\d*'),
             'money',
             {'$', '€', '£', '¥', '₹', 'dollar', 'euro', 'pound', 'usd', 'eur', 'gbp'}
         ))
         
         # Population
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:people|inhabitants|residents|population)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:people|inhabitants|residents|population)'),
             'population',
             {'population', 'people', 'inhabitants', 'residents'}
         ))
         
         # Casualties
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:killed|dead|deaths?|casualties|wounded|injured)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:killed|dead|deaths?|casualties|wounded|injured)'),
             'casualties',
             {'killed', 'dead', 'death', 'casualties', 'wounded'}
         ))
         
         # Votes
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:votes?|ballots?)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:votes?|ballots?)'),
             'votes',
             {'vote', 'ballot'}
         ))
         
         # Duration
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:hours?|minutes?|seconds?|days?|weeks?|months?|years?)\b', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:hours?|minutes?|seconds?|days?|weeks?|months?|years?)\b'),
             'duration',
             {'hour', 'minute', 'second', 'day', 'week', 'month', 'year'}
         ))
         
         # Age
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s+years?\s+old|aged\s+\d+', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s+years?\s+old|aged\s+\d+'),
             'age',
             {'years old', 'aged'}
         ))
         
         # Sports stats
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:goals?|points?|runs?|yards?|rbis?|assists?|rebounds?)', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s+(?:goals?|points?|runs?|yards?|rbis?|assists?|rebounds?)'),
             'record_stat',
             {'goal', 'point', 'run', 'yard', 'rbi', 'assist', 'rebound'}
         ))
@@ -339,28 +401,28 @@ class OptimizedCategorizer:
         
         # Percentage
         self.patterns.append((
-            re.compile(r'\b\d[\d,]*\.?\d*\s?%|\b\d[\d,]*\.?\d*\s+percent', re.I),
+            re.compile(r'\b\d[\d,]*\.?\d*\s?%|\b\d[\d,]*\.?\d*\s+percent'),
             'percentage',
             {'%', 'percent'}
         ))
         
         # Sports score
         self.patterns.append((
-            re.compile(r'\b\d{1,3}[-–]\d{1,3}\b', re.I),
+            re.compile(r'\b\d{1,3}[-–]\d{1,3}\b'),
             'score_sports',
             {'-', '–'}
         ))
         
         # Rating
         self.patterns.append((
-            re.compile(r'\b\d+\.?\d*\s+(?:out of|/)\s+\d+|\b\d+\.?\d*\s+stars?', re.I),
+            re.compile(r'\b\d+\.?\d*\s+(?:out of|/)\s+\d+|\b\d+\.?\d*\s+stars?'),
             'rating',
             {'out of', 'stars', '/'}
         ))
         
         # Ranking
         self.patterns.append((
-            re.compile(r'\b\d+(?:st|nd|rd|th)\s+(?:place|position|largest|biggest|smallest|edition|best|worst)', re.I),
+            re.compile(r'\b\d+(?:st|nd|rd|th)\s+(?:place|position|largest|biggest|smallest|edition|best|worst)'),
             'ranking',
             {'place', 'position', 'largest', 'biggest', 'smallest', 'edition', 'best', 'worst',
              '1st', '2nd', '3rd', 'th '}
@@ -368,35 +430,35 @@ class OptimizedCategorizer:
         
         # Chart position
         self.patterns.append((
-            re.compile(r'#\s?\d+|number\s+\d+\s+(?:on|in).*(?:chart|billboard)', re.I),
+            re.compile(r'#\s?\d+|number\s+\d+\s+(?:on|in).*(?:chart|billboard)'),
             'chart_position',
             {'#', 'chart', 'billboard', 'number'}
         ))
         
         # Richter/earthquake
         self.patterns.append((
-            re.compile(r'(?:magnitude|richter)\s+\d+\.?\d*|\d+\.?\d*\s+(?:on the\s+)?richter', re.I),
+            re.compile(r'(?:magnitude|richter)\s+\d+\.?\d*|\d+\.?\d*\s+(?:on the\s+)?richter'),
             'richter',
             {'magnitude', 'richter', 'earthquake'}
         ))
         
         # Episode/chapter
         self.patterns.append((
-            re.compile(r'(?:episode|chapter|season|volume)\s+\d+', re.I),
+            re.compile(r'(?:episode|chapter|season|volume)\s+\d+'),
             'episode_chapter',
             {'episode', 'chapter', 'season', 'volume'}
         ))
         
         # Century/decade
         self.patterns.append((
-            re.compile(r'\b\d{1,2}(?:st|nd|rd|th)\s+century|\b(?:19|20)\d{2}s\b', re.I),
+            re.compile(r'\b\d{1,2}(?:st|nd|rd|th)\s+century|\b(?:19|20)\d{2}s\b'),
             'century_decade',
             {'century', 'decade', '0s'}
         ))
         
         # Jersey number
         self.patterns.append((
-            re.compile(r'(?:wore|number|#)\s*\d{1,2}\b.*(?:jersey|shirt|uniform)?', re.I),
+            re.compile(r'(?:wore|number|#)\s*\d{1,2}\b.*(?:jersey|shirt|uniform)?'),
             'jersey_number',
             {'wore', 'jersey'}
         ))
@@ -411,18 +473,28 @@ class OptimizedCategorizer:
             set()  # No triggers needed - fallback for 4-digit numbers
         ))
     
-    def _has_triggers(self, context_lower: str) -> bool:
-        """Quick check if context contains ANY trigger words."""
-        for trigger in TRIGGER_SET:
-            if trigger in context_lower:
-                return True
-        return False
+    def _index_patterns(self):
+        """Map each trigger word to the positions of the patterns it enables."""
+        self.patterns_by_trigger = {}
+        self.untriggered_patterns = []
+        
+        for i, (_, _, trigger_words) in enumerate(self.patterns):
+            if not trigger_words:
+                self.untriggered_patterns.append(i)
+            for trigger in trigger_words:
+                self.patterns_by_trigger.setdefault(trigger, []).append(i)
     
     def _get_matching_triggers(self, context_lower: str) -> Set[str]:
         """Get all trigger words found in context."""
         return {t for t in TRIGGER_SET if t in context_lower}
     
-    def categorize(self, number_str: str, context: str) -> str:
+    def categorize(
+        self,
+        number_str: str,
+        context: str,
+        active_triggers: Optional[Set[str]] = None,
+        context_lower: Optional[str] = None
+    ) -> str:
         """
         Categorize a number based on context.
         
@@ -430,46 +502,118 @@ class OptimizedCategorizer:
         1. Quick scan for trigger words
         2. If no triggers AND not a year → return "generic"
         3. Only run patterns whose triggers are present
+        
+        Args:
+            number_str: The number as it appears in the text
+            context: Text surrounding the number
+            active_triggers: Trigger words already known to be in context
+                (e.g. from a TriggerIndex); scanned from context if None
+            context_lower: context.lower(), if the caller already has it
+                (e.g. sliced from a lowercased article)
         """
-        context_lower = context.lower()
-        
-        # Quick path: Check if any triggers present
-        if not self._has_triggers(context_lower):
-            # No triggers - check if it could be a year
-            try:
-                num = int(float(number_str.replace(',', '')))
-                if 1000 <= num <= 2100:
-                    return 'year'
-            except (ValueError, TypeError):
-                pass
-            return 'generic'
-        
-        # Get matching triggers for filtering
-        active_triggers = self._get_matching_triggers(context_lower)
-        
-        # Run patterns in priority order, but only if triggers match
-        for pattern, category, trigger_words in self.patterns:
-            # Skip if pattern requires specific triggers that aren't present
-            if trigger_words and not (trigger_words & active_triggers):
-                continue
-            
-            # Run the pattern
-            match = pattern.search(context)
-            if match:
-                # Verify the number is part of the match
-                num_clean = number_str.replace(',', '')
-                if num_clean in context:
-                    return category
+        if context_lower is None:
+            context_lower = context.lower()
+        
+        # Comma-free form of the number, computed once for every check below
+        num_clean = number_str.replace(',', '') if ',' in number_str else number_str
+        
+        # Patterns only count when the number appears in the context, which
+        # does not depend on the pattern, so check it once up front
+        if num_clean not in context_lower:
+            return self._year_or_generic(num_clean)
+        
+        if active_triggers is None:
+            active_triggers = self._get_matching_triggers(context_lower)
+        
+        # Quick path: no triggers - it can only be a year or generic
+        if not active_triggers:
+            return self._year_or_generic(num_clean)
+        
+        # Only patterns enabled by a present trigger (or needing none) can
+        # match; run those in priority order
+        selected = set(self.untriggered_patterns)
+        patterns_by_trigger = self.patterns_by_trigger
+        for trigger in active_triggers:
+            selected.update(patterns_by_trigger.get(trigger, ()))
+        
+        patterns = self.patterns
+        for i in sorted(selected):
+            pattern, category, _ = patterns[i]
+            if pattern.search(context_lower):
+                return category
         
         # Fallback: Check year
+        return self._year_or_generic(num_clean)
+    
+    @staticmethod
+    def _year_or_generic(num_clean: str) -> str:
+        """Categorize a number no pattern matched: 'year' if in 1000-2100."""
         try:
-            num = int(float(number_str.replace(',', '')))
+            num = int(float(num_clean))
             if 1000 <= num <= 2100:
                 return 'year'
         except (ValueError, TypeError):
             pass
         
         return 'generic'
+    
+    def categorize_batch(
+        self,
+        text: str,
+        spans: List[Tuple[int, int]],
+        context_window: int = 30
+    ) -> List[str]:
+        """
+        Categorize all numbers found in one text in a single call.
+        
+        Trigger words are located once for the whole text, so each number
+        only costs a bisect over its context window plus the pattern checks.
+        The triggers follow from the context, so results are cached by
+        (number, lowercased context).
+        
+        Args:
+            text: Full article text
+            spans: (start, end) positions of each number in text
+            context_window: Characters before/after each number used as context
+            
+        Returns:
+            List of categories, one per span
+        """
+        # The article is lowercased once and contexts are sliced from it.
+        # Lowercasing can change string length for a few non-ASCII
+        # characters, in which case offsets no longer line up and each
+        # context is lowercased and scanned on its own instead
+        text_lower = text.lower()
+        aligned = len(text_lower) == len(text)
+        trigger_index = TriggerIndex(text_lower) if aligned else None
+        
+        text_len = len(text)
+        categorize = self.categorize
+        cache = self._cache
+        categories = []
+        
+        for start, end in spans:
+            context_start = max(0, start - context_window)
+            context_end = min(text_len, end + context_window)
+            number_str = text[start:end]
+            if not aligned:
+                categories.append(categorize(number_str, text[context_start:context_end]))
+                continue
+            
+            context_lower = text_lower[context_start:context_end]
+            key = (number_str, context_lower)
+            category = cache.get(key)
+            if category is None:
+                category = categorize(
+                    number_str, text[context_start:context_end],
+                    trigger_index.window(context_start, context_end), context_lower
+                )
+                if len(cache) >= CATEGORY_CACHE_SIZE:
+                    cache.clear()
+                cache[key] = category
+            categories.append(category)
+        
+        return categories
 
 
 # Global instance
@@ -483,7 +627,25 @@ def get_categorizer():
     return _categorizer
 
 
-def categorize_number(number_str: str, context: str) -> str:
-    """Convenience function for categorizing a single number."""
+@lru_cache(maxsize=CATEGORY_CACHE_SIZE)
+def _categorize_cached(number_str: str, context: str) -> str:
+    """Categorize a number from its context alone, memoized per pair."""
     return get_categorizer().categorize(number_str, context)
 
+
+def categorize_number(
+    number_str: str,
+    context: str,
+    active_triggers: Optional[Set[str]] = None,
+    context_lower: Optional[str] = None
+) -> str:
+    """
+    Convenience function for categorizing a single number.
+    
+    Calls without precomputed triggers or lowercased context depend only on
+    (number_str, context) and are memoized, like categorize_batch.
+    """
+    if active_triggers is None and context_lower is None:
+        return _categorize_cached(number_str, context)
+    return get_categorizer().categorize(number_str, context, active_triggers, context_lower)
+
@@ -3,7 +3,84 @@ Random sampling utilities for Wikipedia article processing.
 """
 
 import random
-from typing import List, Tuple, Optional
+from dataclasses import dataclass
+from typing import List, Tuple, Optional, Union
+
+import numpy as np
+import polars as pl
+
+
+@dataclass
+class IndexEntries:
+    """
+    Multistream index entries as parallel columns.
+    
+    Offsets and article IDs are int64 arrays and titles a Polars string
+    column, instead of one (offset, article_id, title) tuple per article,
+    which keeps a full index (~20M articles) compact and lets sampling and
+    chunking work on whole columns.
+    """
+    offsets: np.ndarray
+    article_ids: np.ndarray
+    titles: pl.Series
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def __getitem__(
+        self,
+        key: Union[int, slice, np.ndarray]
+    ) -> Union[Tuple[int, int, str], "IndexEntries"]:
+        """
+        Get one entry as an (offset, article_id, title) tuple, or a subset
+        of entries for a slice or an array of positions.
+        """
+        if isinstance(key, (int, np.integer)):
+            return (int(self.offsets[key]), int(self.article_ids[key]), self.titles[int(key)])
+        if isinstance(key, slice):
+            titles = self.titles[key]
+        else:
+            titles = self.titles.gather(key)
+        return IndexEntries(self.offsets[key], self.article_ids[key], titles)
+
+
+def parse_index_lines(raw: bytes) -> IndexEntries:
+    """
+    Parse the decompressed contents of a multistream index.
+    
+    Lines are split natively by Polars rather than one at a time in Python,
+    and lines without a numeric offset and article ID are dropped without
+    raising.
+    
+    Args:
+        raw: Index file contents, one offset:article_id:title line per article
+        
+    Returns:
+        Index entries (offsets, article IDs and titles)
+    """
+    # Read whole lines (titles may contain ':' and quotes, so no CSV
+    # splitting or quoting) and split each into offset:id:title
+    lines = pl.read_csv(
+        raw,
+        has_header=False,
+        separator='\x01',
+        quote_char=None,
+        new_columns=['line'],
+        schema_overrides={'line': pl.Utf8},
+        encoding='utf8-lossy'
+    )
+    parts = lines.get_column('line').str.strip_chars().str.splitn(':', 3)
+    df = pl.DataFrame({
+        'offset': parts.struct.field('field_0').cast(pl.Int64, strict=False),
+        'article_id': parts.struct.field('field_1').cast(pl.Int64, strict=False),
+        'title': parts.struct.field('field_2'),
+    }).drop_nulls()
+    
+    return IndexEntries(
+        offsets=df.get_column('offset').to_numpy(),
+        article_ids=df.get_column('article_id').to_numpy(),
+        titles=df.get_column('title'),
+    )
 
 
 class WikipediaSampler:
@@ -22,7 +99,7 @@ class WikipediaSampler:
         if seed is not None:
             random.seed(seed)
     
-    def parse_index(self, index_path: str) -> List[Tuple[int, int, str]]:
+    def parse_index(self, index_path: str) -> IndexEntries:
         """
         Parse the Wikipedia multistream index file.
         
@@ -30,44 +107,32 @@ class WikipediaSampler:
             index_path: Path to the index file (*.bz2)
             
         Returns:
-            List of (offset, article_id, title) tuples
+            Index entries (offsets, article IDs and titles)
         """
         import bz2
         
-        entries = []
-        with bz2.open(index_path, 'rt', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                parts = line.strip().split(':', 2)
-                if len(parts) >= 3:
-                    try:
-                        offset = int(parts[0])
-                        article_id = int(parts[1])
-                        title = parts[2]
-                        entries.append((offset, article_id, title))
-                    except ValueError:
-                        continue
-        
-        return entries
+        with bz2.open(index_path, 'rb') as f:
+            return parse_index_lines(f.read())
     
     def sample_entries(
         self,
-        entries: List[Tuple[int, int, str]],
+        entries: IndexEntries,
         sample_rate: Optional[float] = None,
         sample_count: Optional[int] = None,
         consecutive: bool = False
-    ) -> List[Tuple[int, int, str]]:
+    ) -> IndexEntries:
         """
         Sample entries (random or consecutive).
         
         Args:
-            entries: List of (offset, article_id, title) tuples
+            entries: Index entries
             sample_rate: Fraction to sample (e.g., 0.01 for 1%)
             sample_count: Absolute number to sample
             consecutive: If True, take first N articles (much faster I/O).
                         If False, random sample across entire dataset.
             
         Returns:
-            Sampled list of entries
+            Sampled entries
             
         Note:
             Exactly one of sample_rate or sample_count must be provided.
@@ -96,17 +161,22 @@ class WikipediaSampler:
             # Take first N articles - much faster I/O
             return entries[:sample_count]
         else:
-            # Random sampling without replacement
-            sampled = random.sample(entries, sample_count)
+            # Random sampling without replacement. Sampling positions picks
+            # the same articles for a given seed as sampling the entries.
+            positions = np.fromiter(
+                random.sample(range(total), sample_count),
+                dtype=np.int64,
+                count=sample_count
+            )
             
             # Sort by offset for efficient sequential disk access
-            sampled.sort(key=lambda x: x[0])
+            positions = positions[np.argsort(entries.offsets[positions], kind='stable')]
             
-            return sampled
+            return entries[positions]
     
     def group_by_offset(
         self,
-        entries: List[Tuple[int, int, str]]
+        entries: IndexEntries
     ) -> List[Tuple[int, List[Tuple[int, str]]]]:
         """
         Group entries by BZ2 block offset.
@@ -115,20 +185,24 @@ class WikipediaSampler:
         This groups them together for efficient decompression.
         
         Args:
-            entries: List of (offset, article_id, title) tuples
+            entries: Index entries
             
         Returns:
-            List of (offset, [(article_id, title), ...]) tuples
+            List of (offset, [(article_id, title), ...]) tuples, by offset
         """
-        from collections import defaultdict
-        
-        offset_map = defaultdict(list)
+        order = np.argsort(entries.offsets, kind='stable')
+        offsets = entries.offsets[order]
+        article_ids = entries.article_ids[order].tolist()
+        titles = entries.titles.gather(order).to_list()
         
-        for offset, article_id, title in entries:
-            offset_map[offset].append((article_id, title))
+        # Each offset's entries are one contiguous run of the sorted columns
+        group_offsets, starts = np.unique(offsets, return_index=True)
+        bounds = starts.tolist() + [len(offsets)]
         
-        # Return as sorted list
-        return sorted(offset_map.items())
+        return [
+            (offset, list(zip(article_ids[start:end], titles[start:end])))
+            for offset, start, end in zip(group_offsets.tolist(), bounds, bounds[1:])
+        ]
     
     def estimate_processing_time(
         self,
@@ -196,7 +270,7 @@ def create_sample(
     sample_rate: Optional[float] = None,
     sample_count: Optional[int] = None,
     seed: int = 42
-) -> List[Tuple[int, int, str]]:
+) -> IndexEntries:
     """
     Convenience function to create a random sample.
     
@@ -207,7 +281,7 @@ def create_sample(
         seed: Random seed
         
     Returns:
-        Sampled list of (offset, article_id, title) tuples
+        Sampled index entries
     """
     sampler = WikipediaSampler(seed=seed)
     
@@ -6,23 +6,91 @@ Enhanced with category extraction and detailed benchmarking.
 
 import bz2
 import gc
-import lz4.frame
+import mmap
+import numpy as np
 import time
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Dict, Iterator, Optional, Sequence, Set, Tuple
 from io import BytesIO
-import mwparserfromhell
 import polars as pl
 from lxml import etree
 
-from .extractor import quick_has_numbers, extract_categorized_numbers, analyze_number
-from .categorizer import extract_infobox_type, categorize_by_infobox, strip_wikitext
+from .extractor import quick_has_numbers, extract_number_category_arrays, first_two_digits
+from .categorizer import DOMAINS, extract_infobox_type, categorize_by_infobox, strip_wikitext, strip_wikitext_bytes
+from .number_categorizer import CATEGORIES
+
+
+# Column layout of the per-number records written for each chunk.
+# Domains and categories are stored dictionary-encoded and digits as
+# single bytes, which keeps the parquet files several times smaller.
+RECORD_SCHEMA = {
+    'article_id': pl.UInt32,
+    'domain': pl.Enum(DOMAINS),
+    'number': pl.Float64,
+    'number_category': pl.Enum(CATEGORIES),
+    'first_digit': pl.UInt8,
+    'second_digit': pl.UInt8,
+}
+
+# Enum columns are built by gathering from these with uint8 ids
+DOMAIN_IDS = {domain: i for i, domain in enumerate(DOMAINS)}
+DOMAIN_VALUES = pl.Series(DOMAINS, dtype=RECORD_SCHEMA['domain'])
+CATEGORY_VALUES = pl.Series(CATEGORIES, dtype=RECORD_SCHEMA['number_category'])
+
+
+def chunk_output_path(temp_dir: Path, chunk_id: int) -> Path:
+    """
+    Get the temp file a chunk's records are written to.
+    
+    Args:
+        temp_dir: Directory for temporary output files
+        chunk_id: Chunk identifier
+        
+    Returns:
+        Path of the chunk's parquet file
+    """
+    return temp_dir / f"chunk_{chunk_id:04d}.parquet"
+
+
+# Read-only mappings of dump files, opened once per process
+_dump_maps: Dict[Path, mmap.mmap] = {}
+
+
+def get_dump_map(dump_path: Path) -> mmap.mmap:
+    """
+    Get or create this process's read-only memory map of a dump file.
+    
+    Every chunk of a worker reads from the same mapping, so the dump is
+    opened once per process and all workers share the kernel's page cache
+    instead of each task opening, seeking and copying through a file object.
+    
+    Args:
+        dump_path: Path to Wikipedia dump file
+        
+    Returns:
+        Memory map over the whole file
+    """
+    dump_map = _dump_maps.get(dump_path)
+    if dump_map is None:
+        with open(dump_path, 'rb') as f:
+            dump_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # Streams within a chunk are read front to back
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+            dump_map.madvise(mmap.MADV_SEQUENTIAL)
+        _dump_maps[dump_path] = dump_map
+    return dump_map
 
 
 class ChunkWorker:
     """Worker for processing a chunk of Wikipedia articles."""
     
-    def __init__(self, dump_path: Path, temp_dir: Path, enable_benchmarking: bool = False):
+    def __init__(
+        self,
+        dump_path: Path,
+        temp_dir: Path,
+        enable_benchmarking: bool = False,
+        strict: bool = False
+    ):
         """
         Initialize chunk worker.
         
@@ -30,11 +98,13 @@ class ChunkWorker:
             dump_path: Path to Wikipedia dump file
             temp_dir: Directory for temporary output files
             enable_benchmarking: Enable detailed timing benchmarks
+            strict: Strip markup with mwparserfromhell instead of the fast regex pass
         """
         self.dump_path = dump_path
         self.temp_dir = temp_dir
         self.temp_dir.mkdir(parents=True, exist_ok=True)
         self.enable_benchmarking = enable_benchmarking
+        self.strict = strict
         
         # Benchmarking data
         self.timings = {
@@ -51,7 +121,7 @@ class ChunkWorker:
         chunk_id: int,
         start_offset: int,
         end_offset: int,
-        article_ids: List[int]
+        article_ids: Optional[Sequence[int]]
     ) -> Tuple[Path, int, int, Dict]:
         """
         Process a chunk of articles and write results to temp file.
@@ -60,100 +130,92 @@ class ChunkWorker:
             chunk_id: Chunk identifier
             start_offset: Byte offset to start reading
             end_offset: Byte offset to stop reading
-            article_ids: List of article IDs in this chunk
+            article_ids: Article IDs in this chunk (int64 array or list), or
+                None to process every article in the range
             
         Returns:
             Tuple of (temp_file_path, articles_processed, numbers_extracted, timings_dict)
         """
-        article_ids_set = set(article_ids) if article_ids else None
+        # IDs arrive as an int64 array (or a list); an empty or missing
+        # selection means every article in the range is kept
+        if article_ids is not None and len(article_ids):
+            article_ids_set = set(np.asarray(article_ids).tolist())
+        else:
+            article_ids_set = None
         
-        records = []
+        # Accumulate the chunk as per-article arrays: article_id and domain
+        # id once per article, number and category id arrays per article.
+        # Records and digit columns are built in one vectorized pass once
+        # the chunk is complete.
+        columns = {'article_id': [], 'domain': [], 'number': [], 'number_category': []}
         articles_processed = 0
         numbers_extracted = 0
         
-        # Open dump file and seek to start
-        with open(self.dump_path, 'rb') as f:
-            f.seek(start_offset)
-            
-            # Decompress using BZ2Decompressor for proper stream handling
+        # Each bz2 stream in the range holds ~100 complete <page> elements,
+        # so streams are decompressed and parsed one at a time
+        t_decompress = 0.0
+        t_xml = 0.0
+        streams_processed = 0
+        
+        streams = self._iter_streams(get_dump_map(self.dump_path), start_offset, end_offset)
+        
+        while True:
             t_start = time.perf_counter() if self.enable_benchmarking else None
             try:
-                decompressor = bz2.BZ2Decompressor()
-                decompressed_data = b''
-                read_chunk_size = 8192
-                
-                # Read and decompress until we hit the end of the stream
-                while not decompressor.eof:
-                    chunk = f.read(read_chunk_size)
-                    if not chunk:
-                        break
-                    try:
-                        decompressed_data += decompressor.decompress(chunk)
-                    except EOFError:
-                        break
-                
-                if self.enable_benchmarking:
-                    self.timings['decompress'].append(time.perf_counter() - t_start)
-                
-                if not decompressed_data:
-                    print(f"Warning: No data decompressed for chunk {chunk_id}")
-                    return None, 0, 0, {}
-                    
+                decompressed_data = next(streams, None)
             except Exception as e:
                 print(f"Warning: Could not decompress chunk {chunk_id}: {e}")
                 return None, 0, 0, {}
             
-            # Parse XML
+            if self.enable_benchmarking:
+                t_decompress += time.perf_counter() - t_start
+            
+            if decompressed_data is None:
+                break
+            streams_processed += 1
+            
+            t_xml_start = time.perf_counter() if self.enable_benchmarking else None
             try:
-                t_xml_start = time.perf_counter() if self.enable_benchmarking else None
-                
-                # Wrap in root element with namespace if needed
-                if not decompressed_data.startswith(b'<mediawiki'):
-                    xml_data = b'<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">' + decompressed_data + b'</mediawiki>'
-                else:
-                    xml_data = decompressed_data
-                
-                # Parse with lxml
-                context = etree.iterparse(
-                    BytesIO(xml_data),
-                    events=('end',),
-                    tag='{http://www.mediawiki.org/xml/export-0.11/}page'
+                articles, numbers = self._process_stream(
+                    decompressed_data, article_ids_set, columns
                 )
-                
-                if self.enable_benchmarking:
-                    self.timings['xml_parse'].append(time.perf_counter() - t_xml_start)
-                
-                for event, elem in context:
-                    try:
-                        article_data = self._process_article(elem)
-                        
-                        if article_data:
-                            # Filter by article IDs if provided
-                            if article_ids_set is None or article_data['article_id'] in article_ids_set:
-                                records.extend(article_data['numbers'])
-                                articles_processed += 1
-                                numbers_extracted += len(article_data['numbers'])
-                        
-                        # Clear element to free memory
-                        elem.clear()
-                        while elem.getprevious() is not None:
-                            del elem.getparent()[0]
-                            
-                    except Exception as e:
-                        # Skip problematic articles
-                        continue
-                
-                # Clear context
-                del context
-                
+                articles_processed += articles
+                numbers_extracted += numbers
             except Exception as e:
                 print(f"Warning: XML parsing error in chunk {chunk_id}: {e}")
-                return None, 0, 0, {}
+            
+            if self.enable_benchmarking:
+                t_xml += time.perf_counter() - t_xml_start
+        
+        if not streams_processed:
+            print(f"Warning: No data decompressed for chunk {chunk_id}")
+            return None, 0, 0, {}
+        
+        if self.enable_benchmarking:
+            self.timings['decompress'].append(t_decompress)
+            self.timings['xml_parse'].append(t_xml)
         
         # Write records to temp file
-        if records:
-            df = pl.DataFrame(records)
-            temp_path = self.temp_dir / f"chunk_{chunk_id:04d}.parquet"
+        if columns['number']:
+            counts = [len(numbers) for numbers in columns['number']]
+            numbers = np.concatenate(columns['number'])
+            first_digit, second_digit = first_two_digits(numbers)
+            
+            df = pl.DataFrame({
+                'article_id': np.repeat(np.array(columns['article_id'], dtype=np.uint32), counts),
+                'domain': DOMAIN_VALUES.gather(
+                    np.repeat(np.array(columns['domain'], dtype=np.uint8), counts)
+                ),
+                'number': numbers,
+                'number_category': CATEGORY_VALUES.gather(np.concatenate(columns['number_category'])),
+                'first_digit': first_digit,
+                'second_digit': second_digit,
+            }, schema=RECORD_SCHEMA)
+            
+            # Only keep numbers with valid first digit
+            df = df.filter(pl.col('first_digit') > 0)
+            numbers_extracted = df.height
+            temp_path = chunk_output_path(self.temp_dir, chunk_id)
             
             # Write with LZ4 compression
             df.write_parquet(temp_path, compression='lz4')
@@ -165,6 +227,116 @@ class ChunkWorker:
         
         return None, articles_processed, numbers_extracted, self.timings
     
+    def _iter_streams(
+        self,
+        dump: mmap.mmap,
+        start_offset: int,
+        end_offset: int,
+        read_size: int = 1 << 20
+    ) -> Iterator[bytes]:
+        """
+        Decompress the bz2 streams stored between two byte offsets.
+        
+        Args:
+            dump: Memory map of the dump file
+            start_offset: Byte offset of the first stream
+            end_offset: Byte offset just past the last stream (-1 for end of file)
+            read_size: Compressed bytes to feed the decompressor at a time
+            
+        Yields:
+            Decompressed contents of each stream, in order
+        """
+        if end_offset < 0:
+            end_offset = len(dump)
+        view = memoryview(dump)[start_offset:end_offset]
+        
+        decompressor = bz2.BZ2Decompressor()
+        parts = []
+        
+        try:
+            for pos in range(0, len(view), read_size):
+                data = view[pos:pos + read_size]
+                
+                # A slice can end one stream and start the next
+                while data:
+                    parts.append(decompressor.decompress(data))
+                    if not decompressor.eof:
+                        break
+                    yield b''.join(parts)
+                    parts = []
+                    data = decompressor.unused_data
+                    decompressor = bz2.BZ2Decompressor()
+        finally:
+            view.release()
+        
+        # Truncated final stream: hand over whatever was recovered
+        if any(parts):
+            yield b''.join(parts)
+    
+    def _process_stream(
+        self,
+        decompressed_data: bytes,
+        article_ids_set: Optional[Set[int]],
+        columns: Dict[str, list]
+    ) -> Tuple[int, int]:
+        """
+        Parse the pages of one decompressed stream and append their records.
+        
+        Args:
+            decompressed_data: XML fragment of one bz2 stream
+            article_ids_set: Article IDs to keep, or None to keep all
+            columns: Per-article column lists to append the extracted records to
+            
+        Returns:
+            Tuple of (articles_processed, numbers_extracted)
+        """
+        articles_processed = 0
+        numbers_extracted = 0
+        
+        # Wrap in root element with namespace if needed. The first and last
+        # streams of the dump carry the <mediawiki> header and closing tag.
+        xml_data = decompressed_data.rstrip()
+        if xml_data.endswith(b'</mediawiki>'):
+            xml_data = xml_data[:-len(b'</mediawiki>')]
+        if not xml_data.startswith(b'<mediawiki'):
+            xml_data = b'<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.11/">' + xml_data
+        xml_data += b'</mediawiki>'
+        
+        # Parse with lxml
+        context = etree.iterparse(
+            BytesIO(xml_data),
+            events=('end',),
+            tag='{http://www.mediawiki.org/xml/export-0.11/}page'
+        )
+        
+        for event, elem in context:
+            try:
+                article_data = self._process_article(elem)
+                
+                if article_data:
+                    # Filter by article IDs if provided
+                    if article_ids_set is None or article_data['article_id'] in article_ids_set:
+                        columns['article_id'].append(article_data['article_id'])
+                        columns['domain'].append(DOMAIN_IDS[article_data['domain']])
+                        for name in ('number', 'number_category'):
+                            columns[name].append(article_data[name])
+                        articles_processed += 1
+                        numbers_extracted += len(article_data['number'])
+                
+                # Clear element to free memory
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+                    
+            except Exception as e:
+                # Skip problematic articles
+                continue
+        
+        # Clear context
+        del context
+        
+        return articles_processed, numbers_extracted
+    
     def _process_article(self, page_elem) -> Dict:
         """
         Process a single article element.
@@ -173,7 +345,8 @@ class ChunkWorker:
             page_elem: lxml Element for a page
             
         Returns:
-            Dict with article_id and list of number records, or None
+            Dict with article_id, domain, and number/number_category arrays
+            (float64 numbers, uint8 ids indexing CATEGORIES), or None
         """
         ns = '{http://www.mediawiki.org/xml/export-0.11/}'
         
@@ -221,8 +394,11 @@ class ChunkWorker:
             # Strip wikitext to plain text
             t_strip_start = time.perf_counter() if self.enable_benchmarking else None
             try:
-                plain_text = strip_wikitext(wikitext)
-                text_bytes = plain_text.encode('utf-8', errors='ignore')
+                if self.strict:
+                    plain_text = strip_wikitext(wikitext, strict=True)
+                    text_bytes = plain_text.encode('utf-8', errors='ignore')
+                else:
+                    text_bytes = strip_wikitext_bytes(wikitext_bytes)
             except Exception:
                 # If stripping fails, use original
                 text_bytes = wikitext_bytes
@@ -232,36 +408,22 @@ class ChunkWorker:
             
             # Extract numbers with categories
             t_extract_start = time.perf_counter() if self.enable_benchmarking else None
-            numbers_with_categories = extract_categorized_numbers(text_bytes)
+            numbers, category_ids = extract_number_category_arrays(text_bytes)
             
             if self.enable_benchmarking:
                 self.timings['extract_numbers'].append(time.perf_counter() - t_extract_start)
             
-            if not numbers_with_categories:
+            if not len(numbers):
                 return None
             
-            # Create records
-            records = []
-            for number, category in numbers_with_categories:
-                first_digit, second_digit = analyze_number(number)
-                
-                # Only keep numbers with valid first digit
-                if first_digit > 0:
-                    records.append({
-                        'article_id': article_id,
-                        'domain': domain,
-                        'number': number,
-                        'number_category': category,  # NEW FIELD
-                        'first_digit': first_digit,
-                        'second_digit': second_digit
-                    })
-            
             if self.enable_benchmarking and t_article_start:
                 self.timings['total_per_article'].append(time.perf_counter() - t_article_start)
             
             return {
                 'article_id': article_id,
-                'numbers': records
+                'domain': domain,
+                'number': numbers,
+                'number_category': category_ids
             }
             
         except Exception as e:
@@ -275,9 +437,10 @@ def process_chunk_with_retry(
     temp_dir: Path,
     start_offset: int,
     end_offset: int,
-    article_ids: List[int],
+    article_ids: Optional[Sequence[int]],
     max_retries: int = 3,
-    enable_benchmarking: bool = False
+    enable_benchmarking: bool = False,
+    strict: bool = False
 ) -> Tuple[Path, int, int, Dict]:
     """
     Process a chunk with retry logic.
@@ -291,11 +454,17 @@ def process_chunk_with_retry(
         article_ids: List of article IDs in chunk
         max_retries: Maximum number of retry attempts
         enable_benchmarking: Enable detailed timing
+        strict: Strip markup with mwparserfromhell instead of the fast regex pass
         
     Returns:
         Tuple of (temp_file_path, articles_processed, numbers_extracted, timings_dict)
     """
-    worker = ChunkWorker(dump_path, temp_dir, enable_benchmarking=enable_benchmarking)
+    worker = ChunkWorker(
+        dump_path,
+        temp_dir,
+        enable_benchmarking=enable_benchmarking,
+        strict=strict
+    )
     
     for attempt in range(max_retries):
         try:
@@ -11,7 +11,7 @@ import tempfile
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src import extractor, categorizer, checkpoint, analyzer
+from src import extractor, categorizer, checkpoint, analyzer, sampler
 
 
 def test_extractor():
@@ -43,8 +43,74 @@ def test_extractor():
             second == expected_second
         ), f"Second digit of {number} should be {expected_second}, got {second}"
 
+    # Vectorized digits agree with the per-number functions
+    first, second = extractor.first_two_digits([n for n, _, _ in test_cases])
+    assert list(zip(first.tolist(), second.tolist())) == [(f, s) for _, f, s in test_cases]
+    first, second = extractor.first_two_digits([3e15, 1999999999999999.5, 10.0])
+    assert list(zip(first.tolist(), second.tolist())) == [(3, 0), (2, 0), (1, 0)]
+
+    # Both paths agree where '.15g' switches to exponent form
+    exponent_form = [1e15, 3e15, 9e15]
+    first, second = extractor.first_two_digits(exponent_form)
+    assert list(zip(first.tolist(), second.tolist())) == [
+        extractor.analyze_number(n) for n in exponent_form
+    ] == [(1, 0), (3, 0), (9, 0)]
+
     print(f"✓ First/second digit extraction working")
 
+    # Test leading digit histogram
+    text_bytes = test_text.encode("utf-8")
+    counts = extractor.count_leading_digits(text_bytes)
+    expected_counts = [0] * 10
+    for number in extractor.extract_numbers_from_bytes(text_bytes):
+        expected_counts[extractor.get_first_digit(number)] += 1
+    assert counts.tolist() == expected_counts, f"Got {counts.tolist()}, expected {expected_counts}"
+    print(f"✓ Leading digit histogram working")
+
+    # Test vectorized scanner against the regex, including decimals,
+    # dot chains, leading zeros and over-long digit runs
+    scan_text = b"v1.2.3 at 0.5 and 07 or 12.34.56.78, 12345678901234567 x 1234567890123456.9"
+    expected_starts = [m.start() for m in extractor.NUMBER_PATTERN.finditer(scan_text)]
+    assert extractor.find_number_starts(scan_text).tolist() == expected_starts
+    starts, ends = extractor.find_number_spans(scan_text)
+    assert list(zip(starts.tolist(), ends.tolist())) == [
+        m.span() for m in extractor.NUMBER_PATTERN.finditer(scan_text)
+    ]
+
+    # Long texts are extracted through the scanner, short ones by the regex
+    long_text = scan_text * 50
+    assert len(long_text) >= extractor.VECTOR_SCAN_MIN_BYTES
+    assert extractor.extract_numbers_from_bytes(long_text) == [
+        n for n in map(float, extractor.NUMBER_PATTERN.findall(long_text)) if n < 1e16
+    ]
+
+    # Character spans in decoded text, with multi-byte characters before numbers
+    unicode_text = "Area 42.5 km² in 日本, 1,234 m — 0.7 ".encode("utf-8") * 100
+    decoded = unicode_text.decode("utf-8")
+    assert extractor.find_text_number_spans(decoded, unicode_text) == [
+        m.span() for m in extractor.NUMBER_PATTERN_STR.finditer(decoded)
+    ]
+
+    # A lone continuation byte dropped in decoding joins "35" and "3"
+    invalid_text = "é 35".encode("utf-8") + b"\xa93 x " + b"12 " * 1000
+    decoded = invalid_text.decode("utf-8", errors="ignore")
+    assert extractor.find_text_number_spans(decoded, invalid_text) == [
+        m.span() for m in extractor.NUMBER_PATTERN_STR.finditer(decoded)
+    ]
+    print(f"✓ Vectorized number scanner working")
+
+    # Test digit/category arrays against the tuple-based extraction; a
+    # 16-digit match that parses to 1e16 is dropped by both
+    text_bytes += b" Overflow 9999999999999999."
+    digits, category_ids = extractor.extract_digit_category_arrays(text_bytes)
+    categorized = extractor.extract_categorized_numbers(text_bytes)
+    assert digits.tolist() == [extractor.get_first_digit(num) for num, _ in categorized]
+    assert [extractor.CATEGORIES[i] for i in category_ids] == [cat for _, cat in categorized]
+    numbers, category_ids = extractor.extract_number_category_arrays(text_bytes)
+    assert numbers.tolist() == [num for num, _ in categorized]
+    assert [extractor.CATEGORIES[i] for i in category_ids] == [cat for _, cat in categorized]
+    print(f"✓ Digit/category arrays working")
+
     # Test quick check
     text_with_numbers = b"Population: 123456"
     text_without_numbers = b"No digits here"
@@ -72,6 +138,8 @@ def test_categorizer():
         ("{{Infobox bridge}}", "Infrastructure"),
         ("{{Infobox election}}", "Events"),
         ("Some text without infobox", "Uncategorized"),
+        ("{{Short description|x}}\n{{ Infobox musical artist <!-- c -->\n| name = X}}", "People"),
+        ("{{Infobox}} {{{infobox|}}} {{Infobox ship|a}}", "Military"),
     ]
 
     for wikitext, expected_domain in test_cases:
@@ -79,6 +147,26 @@ def test_categorizer():
         assert domain == expected_domain, f"Expected {expected_domain}, got {domain}"
         print(f"✓ {expected_domain:15} <- {wikitext[:40]}")
 
+    # Plain text skips the strict parser but is collapsed the same way
+    plain = "\nPopulation 1234.\n\n\n\nFounded 1999\n"
+    assert categorizer.strip_wikitext(plain, strict=True) == "Population 1234.\n\nFounded 1999"
+    print(f"✓ Strict strip of plain text working")
+
+    # Cell attributes are dropped by the fast strip, as by the parser
+    table = (
+        '{| class="wikitable" border="1"\n'
+        '! scope="col" | Year !! style="width:30%" | Population\n'
+        '|-\n'
+        '| colspan="2" style="width:30%" | 1990 || 12,345\n'
+        '|-\n'
+        '| rowspan=3 | [[Paris|Paris 75]] || bgcolor=#FF0000 | 42\n'
+        '|}'
+    )
+    fast = extractor.extract_numbers_from_text(categorizer.strip_wikitext(table))
+    strict = extractor.extract_numbers_from_text(categorizer._strip_wikitext_strict(table))
+    assert fast == strict == [1990, 12, 345, 75, 42], f"{fast} != {strict}"
+    print(f"✓ Table cell attributes stripped")
+
     print()
 
 
@@ -106,9 +194,28 @@ def test_checkpoint():
         manager.mark_chunk_failed(1, error="Test error", retries=1)
         print(f"✓ Marked chunk 1 as failed")
 
-        # Reload state
+        # Marks are appended to the event log, not written as snapshots
+        assert manager.log_path.exists(), "Marks should be logged"
+
+        # Reload state twice; loading replays the log without writing, and
+        # replaying it again gives the same state
         manager2 = checkpoint.StateManager(state_path)
         state2 = manager2.load()
+        assert manager2.log_path.exists(), "Loading should not compact the log"
+        assert checkpoint.StateManager(state_path).load() == state2, "Replay should be idempotent"
+
+        # A torn final line is dropped before the next append
+        with open(manager2.log_path, "ab") as f:
+            f.write(b'{"op": "comp')
+        manager3 = checkpoint.StateManager(state_path)
+        manager3.load()
+        manager3.mark_chunk_started(2)
+        assert 2 in checkpoint.StateManager(state_path).load().in_progress_chunks
+
+        # Compaction folds the log into the snapshot
+        assert manager2.compact()
+        assert not manager2.log_path.exists(), "Compacted log should be removed"
+        assert checkpoint.StateManager(state_path).load() == state2
 
         assert len(state2.completed_chunks) == 1, "Should have 1 completed chunk"
         assert len(state2.failed_chunks) == 1, "Should have 1 failed chunk"
@@ -125,6 +232,31 @@ def test_checkpoint():
     print()
 
 
+def test_sampler():
+    """Test index parsing and sampling."""
+    print("Testing sampler module...")
+    print("-" * 60)
+
+    raw = b"600:12:Alpha\n600:10:Beta: the sequel\nbad line\n900:11:Gamma\n"
+    entries = sampler.parse_index_lines(raw)
+    assert len(entries) == 3, "Malformed lines should be dropped"
+    assert entries[1] == (600, 10, "Beta: the sequel")
+    print(f"✓ Parsed {len(entries)} index entries")
+
+    # Sampling picks the same articles as sampling the tuples would,
+    # in offset order
+    sampled = sampler.WikipediaSampler(seed=1).sample_entries(entries, sample_count=2)
+    import random
+    random.seed(1)
+    expected = sorted(random.sample([entries[i] for i in range(3)], 2), key=lambda x: x[0])
+    assert [sampled[i] for i in range(2)] == expected
+    groups = sampler.WikipediaSampler().group_by_offset(entries)
+    assert groups == [(600, [(12, "Alpha"), (10, "Beta: the sequel")]), (900, [(11, "Gamma")])]
+    print(f"✓ Sampling and grouping working")
+
+    print()
+
+
 def test_analyzer():
     """Test analysis module."""
     print("Testing analyzer module...")
@@ -162,15 +294,33 @@ def test_analyzer():
     assert abs(sum(freq.values()) - 1.0) < 0.01, "Frequencies should sum to ~1"
     print(f"✓ Frequency calculation working")
 
+    # Test all-domain frequency matrix against the per-domain calculation
+    domains, frequencies, n_samples_all = analyzer.all_frequencies(sample_df)
+    assert domains == ["Geography", "People", "Science"]
+    geo = domains.index("Geography")
+    assert np.allclose(frequencies[geo], [freq[d] for d in range(1, 10)])
+    assert n_samples_all.sum() == n_samples
+    print(f"✓ Frequency matrix working")
+
     # Test statistical tests
     chi2, p_value = analyzer.chi_square_test(
         freq, sample_df.filter(pl.col("domain") == "Geography").height
     )
     print(f"✓ Chi-square test working (χ²={chi2:.2f}, p={p_value:.4f})")
 
+    chi2_all, p_value_all = analyzer.chi_square_tests(frequencies, n_samples_all)
+    assert np.isclose(chi2_all[geo], chi2)
+    assert np.isclose(p_value_all[geo], p_value)
+    print(f"✓ Vectorized chi-square tests working")
+
     mad = analyzer.mean_absolute_deviation(freq)
     print(f"✓ MAD calculation working (MAD={mad:.4f})")
 
+    mad_all, ks_all = analyzer.deviation_statistics(frequencies)
+    assert np.isclose(mad_all[geo], mad)
+    assert np.isclose(ks_all[geo], analyzer.kolmogorov_smirnov_test(freq)[0])
+    print(f"✓ Vectorized deviation statistics working")
+
     # Test summary generation
     summary = analyzer.generate_summary_table(sample_df)
     assert summary.height == 3, "Should have 3 domains"
@@ -179,6 +329,49 @@ def test_analyzer():
     print()
 
 
+def test_merge():
+    """Test merging per-chunk parquet files into the final output."""
+    print("Testing parquet merge...")
+    print("-" * 60)
+
+    import polars as pl
+    import process_wiki
+    from src.worker import RECORD_SCHEMA, chunk_output_path
+
+    def records(n):
+        return pl.DataFrame(
+            {
+                "article_id": list(range(n)),
+                "domain": ["Geography"] * n,
+                "number": [1234.0] * n,
+                "number_category": ["generic"] * n,
+                "first_digit": [1] * n,
+                "second_digit": [2] * n,
+            },
+            schema=RECORD_SCHEMA,
+        )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        temp_dir = Path(tmpdir)
+        temp_files = [chunk_output_path(temp_dir, chunk_id) for chunk_id in range(3)]
+        records(3).write_parquet(temp_files[0])
+        records(4).write_parquet(temp_files[1])
+        # Left over from a run with a different record layout
+        records(5).with_columns(pl.col("domain").cast(pl.Utf8)).write_parquet(temp_files[2])
+
+        output_path = temp_dir / "out" / "numbers.parquet"
+        process_wiki.merge_parquet_files(temp_files, output_path)
+
+        merged = pl.read_parquet(output_path)
+        assert merged.height == 7, f"Should merge 7 records, got {merged.height}"
+        assert merged.schema == pl.Schema(RECORD_SCHEMA)
+        assert not temp_files[0].exists() and not temp_files[1].exists(), "Merged files should be removed"
+        assert temp_files[2].exists(), "Skipped file should be kept"
+    print(f"✓ Merge skips and keeps mismatched files")
+
+    print()
+
+
 def test_integration():
     """Test that all components work together."""
     print("Testing integration...")
@@ -223,7 +416,9 @@ def main():
         test_extractor()
         test_categorizer()
         test_checkpoint()
+        test_sampler()
         test_analyzer()
+        test_merge()
         test_integration()
 
         print("=" * 80)
@@ -6,7 +6,7 @@ Tests conflict resolution and priority ordering.
 import sys
 sys.path.insert(0, '/root/Benfords-exploration')
 
-from src.number_categorizer import categorize_number
+from src.number_categorizer import CATEGORIES, categorize_number, get_categorizer
 
 
 def test_conflict_resolution():
@@ -34,6 +34,7 @@ def test_conflict_resolution():
         # Temperature
         ("25", "25°C today", "temperature"),
         ("77", "77°F outside", "temperature"),
+        ("4", "4 kΩ °C", "generic"),  # Ω is a word character, so kΩ is not kelvin
         
         # Coordinates
         ("37", "37.7749° N latitude", "coordinates"),
@@ -153,6 +154,13 @@ def test_conflict_resolution():
     return passed, failed
 
 
+def test_categories_complete():
+    """Test that every pattern category is listed in CATEGORIES."""
+    pattern_categories = {category for _, category, _ in get_categorizer().patterns}
+    missing = pattern_categories - set(CATEGORIES)
+    assert not missing, f"Categories missing from CATEGORIES: {sorted(missing)}"
+
+
 if __name__ == "__main__":
     passed, failed = test_conflict_resolution()
     
@@ -11,9 +11,11 @@ from pathlib import Path
 sys.path.insert(0, '/root/Benfords-exploration')
 
 from collections import Counter
-from src.extractor import extract_numbers_from_bytes, extract_categorized_numbers
-from src.categorizer import strip_wikitext
-from src.number_categorizer import categorize_number
+from operator import itemgetter
+import numpy as np
+from src.extractor import extract_numbers_from_bytes, extract_categorized_numbers, count_leading_digits, extract_digit_category_arrays
+from src.categorizer import strip_wikitext, _strict_cache
+from src.number_categorizer import categorize_number, get_categorizer, TriggerIndex
 import mwparserfromhell
 import re
 
@@ -71,18 +73,17 @@ As of 2020, the city had:
 
 def benchmark_operation(name, func, iterations=100):
     """Benchmark a function multiple times."""
-    times = []
+    times = np.empty(iterations, dtype=np.float64)
     
     for i in range(iterations):
         start = time.perf_counter()
         result = func()
         elapsed = time.perf_counter() - start
-        times.append(elapsed * 1000)  # Convert to ms
+        times[i] = elapsed * 1000  # Convert to ms
     
-    avg = sum(times) / len(times)
-    median = sorted(times)[len(times) // 2]
-    p95 = sorted(times)[int(len(times) * 0.95)]
-    max_time = max(times)
+    avg = times.mean()
+    median, p95 = np.percentile(times, [50, 95])
+    max_time = times.max()
     
     print(f"\n{name}:")
     print(f"  Mean:   {avg:>8.2f} ms")
@@ -125,6 +126,17 @@ def main():
     strip_time, plain_text = benchmark_operation("strip_wikitext", test_strip, 100)
     plain_bytes = plain_text.encode('utf-8')
     
+    def test_strip_strict():
+        _strict_cache.clear()
+        return strip_wikitext(SAMPLE_ARTICLE, strict=True)
+    
+    benchmark_operation("strip_wikitext (strict, mwparserfromhell)", test_strip_strict, 100)
+    
+    def test_strip_strict_cached():
+        return strip_wikitext(SAMPLE_ARTICLE, strict=True)
+    
+    benchmark_operation("strip_wikitext (strict, cached)", test_strip_strict_cached, 100)
+    
     # Test 3: Simple number extraction (old method)
     print("\n" + "="*70)
     print("TEST 3: Simple Number Extraction (No Categories)")
@@ -136,6 +148,12 @@ def main():
     simple_time, simple_numbers = benchmark_operation("extract_numbers_from_bytes", test_simple_extract, 100)
     print(f"  Numbers found: {len(simple_numbers)}")
     
+    def test_digit_histogram():
+        return count_leading_digits(plain_bytes)
+    
+    histogram_time, digit_counts = benchmark_operation("count_leading_digits (NumPy)", test_digit_histogram, 100)
+    print(f"  Numbers found: {int(digit_counts.sum())}")
+    
     # Test 4: Categorized extraction (new method)
     print("\n" + "="*70)
     print("TEST 4: Categorized Number Extraction (With Categories)")
@@ -149,7 +167,7 @@ def main():
     
     # Show category breakdown
     if categorized_numbers:
-        categories = Counter(cat for _, cat in categorized_numbers[:20])
+        categories = Counter(map(itemgetter(1), categorized_numbers[:20]))
         print(f"\n  Sample categories:")
         for cat, count in categories.most_common(10):
             print(f"    {cat:20} {count:>3}")
@@ -163,6 +181,10 @@ def main():
     
     def test_optimized_extract():
         results = []
+        # Lowercase and scan trigger words once per article instead of
+        # once per number
+        plain_text_lc = plain_text.lower()
+        trigger_index = TriggerIndex(plain_text_lc)
         for match in NUMBER_PATTERN.finditer(plain_text):
             num_str = match.group(0)
             start_pos = match.start()
@@ -171,15 +193,20 @@ def main():
             context_end = min(len(plain_text), end_pos + 30)
             context = plain_text[context_start:context_end]
             
-            category = categorize_number(num_str, context)
-            results.append((float(num_str.replace(',', '')), category))
+            triggers = trigger_index.window(context_start, context_end)
+            category = categorize_number(
+                num_str, context, triggers, plain_text_lc[context_start:context_end]
+            )
+            # Only the leading digit matters for Benford analysis, and it is
+            # the first character of every match - no float parse needed
+            results.append((ord(num_str[0]) - 48, category))
         return results
     
     optimized_time, optimized_numbers = benchmark_operation("extract_categorized_OPTIMIZED", test_optimized_extract, 100)
     print(f"  Numbers found: {len(optimized_numbers)}")
     
     if optimized_numbers:
-        categories = Counter(cat for _, cat in optimized_numbers[:20])
+        categories = Counter(map(itemgetter(1), optimized_numbers[:20]))
         print(f"\n  Sample categories:")
         for cat, count in categories.most_common(10):
             print(f"    {cat:20} {count:>3}")
@@ -187,6 +214,46 @@ def main():
     speedup = categorized_time / optimized_time if optimized_time > 0 else 0
     print(f"\n  🚀 SPEEDUP: {speedup:.1f}x faster than original!")
     
+    def test_array_extract():
+        return extract_digit_category_arrays(plain_bytes)
+    
+    array_time, (digits, category_ids) = benchmark_operation("extract_digit_category_arrays (uint8 SoA)", test_array_extract, 100)
+    print(f"  Numbers found: {len(digits)}")
+    
+    # Test 5b: All patterns fused into one alternation
+    print("\n" + "="*70)
+    print("TEST 5b: Fused Pattern Union (single search, category via lastgroup)")
+    print("="*70)
+    
+    patterns = get_categorizer().patterns
+    fused_categories = [category for _, category, _ in patterns]
+    FUSED_PATTERN = re.compile(
+        '|'.join(f'(?P<c{i}>{pattern.pattern})' for i, (pattern, _, _) in enumerate(patterns)),
+        re.I
+    )
+    
+    def test_fused_extract():
+        results = []
+        for match in NUMBER_PATTERN.finditer(plain_text):
+            num_str = match.group(0)
+            context_start = max(0, match.start() - 30)
+            context_end = min(len(plain_text), match.end() + 30)
+            fused_match = FUSED_PATTERN.search(plain_text[context_start:context_end])
+            category = fused_categories[int(fused_match.lastgroup[1:])] if fused_match else 'generic'
+            results.append((ord(num_str[0]) - 48, category))
+        return results
+    
+    fused_time, fused_numbers = benchmark_operation("extract_categorized_FUSED", test_fused_extract, 100)
+    
+    # The union reports the leftmost match, not the highest-priority one,
+    # so categories can differ from the trigger-filtered loop
+    disagreements = sum(
+        1 for (_, fused_cat), (_, opt_cat) in zip(fused_numbers, optimized_numbers)
+        if fused_cat != opt_cat
+    )
+    print(f"  Disagrees with priority order: {disagreements}/{len(fused_numbers)} numbers")
+    print(f"  vs trigger pre-filtering: {optimized_time / fused_time:.2f}x" if fused_time > 0 else "")
+    
     # Summary
     print("\n" + "="*70)
     print("SUMMARY - Time Breakdown Per Article")